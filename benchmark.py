@@ -0,0 +1,216 @@
+"""
+Headless benchmark harness
+Drives every game and menu screen with scripted input under SDL's dummy
+video driver and reports frame timings as JSON
+
+Usage:
+    python benchmark.py --frames 600 --output results.json
+    python benchmark.py --save-baseline baseline.json
+    python benchmark.py --baseline baseline.json --threshold 0.10
+"""
+import argparse
+import contextlib
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Must be set before pygame is imported so no window or audio device is opened
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+import config
+import game_registry
+import high_score
+import leaderboard
+import sudoku_bank
+from compositor import Compositor
+from frame_profiler import percentile
+
+SCENARIOS = ["lobby", "game_over"] + [info.key for info in game_registry.GAMES]
+
+def key_event(key, unicode=""):
+    """Build a KEYDOWN event as pygame would deliver it"""
+    return pygame.event.Event(pygame.KEYDOWN, key=key, unicode=unicode, mod=0, scancode=0)
+
+def script_lobby(rng, frame):
+    """Scroll up and down through the game list"""
+    if frame % 15 == 0:
+        return [key_event(rng.choice([pygame.K_UP, pygame.K_DOWN]))]
+    return []
+
+def script_game_over(rng, frame):
+    """Move between the two buttons"""
+    if frame % 20 == 0:
+        return [key_event(pygame.K_LEFT)]
+    return []
+
+def script_snake(rng, frame):
+    """Turn in a random direction every few moves"""
+    if frame % 25 == 0:
+        return [key_event(rng.choice([pygame.K_UP, pygame.K_DOWN, pygame.K_LEFT, pygame.K_RIGHT]))]
+    return []
+
+def script_flappy_bird(rng, frame):
+    """Flap at a steady cadence with a little jitter"""
+    if frame % 18 == rng.randint(0, 1):
+        return [key_event(pygame.K_SPACE)]
+    return []
+
+def script_sudoku(rng, frame):
+    """Pick a difficulty, then wander the board entering digits"""
+    if frame == 1:
+        return [key_event(pygame.K_RETURN)]
+    if frame % 6 == 0:
+        if rng.random() < 0.5:
+            return [key_event(rng.choice([pygame.K_UP, pygame.K_DOWN, pygame.K_LEFT, pygame.K_RIGHT]))]
+        digit = rng.randint(1, 9)
+        return [key_event(pygame.K_0 + digit, str(digit))]
+    return []
+
+def script_mario(rng, frame):
+    """Mario reads the keyboard state directly, so no events are needed"""
+    return []
+
+def create_screen(name, screen):
+    """Construct the object under test, or None if it is unavailable"""
+    if name == "lobby":
+        from lobby import Lobby
+        return Lobby(screen)
+    if name == "game_over":
+        from game_over import GameOver
+        return GameOver(screen, 42, "snake")
+    try:
+        return game_registry.create_game(name, screen)
+    except ImportError as e:
+        print(f"Skipping {name}: {e}", file=sys.stderr)
+        return None
+
+@contextlib.contextmanager
+def isolated_storage():
+    """Point the leaderboard and the Sudoku puzzle bank at a scratch directory
+
+    Scripted runs stay out of the player's scores, and Sudoku always starts
+    from an empty bank with background refills off, so every run generates
+    the same puzzles on the same frames.
+    """
+    saved = (leaderboard.LEADERBOARD_FILE, high_score.HIGH_SCORE_FILE,
+             config.SUDOKU_BANK_DIR, config.SUDOKU_BANK_WORKERS)
+    with tempfile.TemporaryDirectory(prefix="benchmark-") as directory:
+        leaderboard.LEADERBOARD_FILE = os.path.join(directory, "leaderboard.db")
+        high_score.HIGH_SCORE_FILE = os.path.join(directory, "high_score.json")
+        config.SUDOKU_BANK_DIR = os.path.join(directory, "puzzle_bank")
+        config.SUDOKU_BANK_WORKERS = 0
+        try:
+            yield
+        finally:
+            # Close both before the directory is removed
+            high_score.shutdown()
+            sudoku_bank.shutdown()
+            (leaderboard.LEADERBOARD_FILE, high_score.HIGH_SCORE_FILE,
+             config.SUDOKU_BANK_DIR, config.SUDOKU_BANK_WORKERS) = saved
+
+def run_scenario(name, screen, frames, seed):
+    """Run one scenario for a number of frames, return its timing stats"""
+    random.seed(seed)
+    rng = random.Random(seed)
+    target = create_screen(name, screen)
+    if target is None:
+        return {"skipped": True}
+    script = globals()[f"script_{name}"]
+    compositor = Compositor(screen)
+
+    frame_times = []
+    start = time.perf_counter()
+    for frame in range(frames):
+        frame_start = time.perf_counter()
+        pygame.event.pump()
+        for event in script(rng, frame):
+            target.handle_event(event)
+        if hasattr(target, "update"):
+            target.update()
+        compositor.present(target.draw(), target)
+        if hasattr(target, "is_game_over") and target.is_game_over():
+            if not hasattr(target, "reset_game"):
+                break
+            target.reset_game()
+        frame_times.append((time.perf_counter() - frame_start) * 1000.0)
+    total = time.perf_counter() - start
+
+    ordered = sorted(frame_times)
+    return {
+        "frames": len(ordered),
+        "fps": len(ordered) / total if total > 0 else 0.0,
+        "mean_ms": sum(ordered) / len(ordered) if ordered else 0.0,
+        "p50_ms": percentile(ordered, 0.50),
+        "p95_ms": percentile(ordered, 0.95),
+        "p99_ms": percentile(ordered, 0.99),
+        "pixels_per_frame": compositor.average_pixels_per_frame(),
+    }
+
+def compare(results, baseline, threshold):
+    """Return a list of regression messages against a saved baseline"""
+    regressions = []
+    for name, stats in results.items():
+        base = baseline.get(name)
+        if not base or stats.get("skipped") or base.get("skipped"):
+            continue
+        for metric in ("mean_ms", "p95_ms", "p99_ms"):
+            if base[metric] > 0 and stats[metric] > base[metric] * (1.0 + threshold):
+                regressions.append(f"{name}: {metric} {base[metric]:.3f} -> {stats[metric]:.3f} ms "
+                                   f"(+{(stats[metric] / base[metric] - 1.0) * 100:.1f}%)")
+    return regressions
+
+def main(argv=None):
+    """Benchmark entry point"""
+    parser = argparse.ArgumentParser(description="Headless frame-time benchmark for every game")
+    parser.add_argument("--frames", type=int, default=600, help="frames to run per scenario")
+    parser.add_argument("--seed", type=int, default=1234, help="seed for scripted input and game RNG")
+    parser.add_argument("--games", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument("--output", help="write results JSON here instead of stdout")
+    parser.add_argument("--save-baseline", help="write results as a baseline file")
+    parser.add_argument("--baseline", help="compare against this baseline and flag regressions")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="allowed slowdown before a metric counts as a regression")
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    screen = pygame.display.set_mode((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
+
+    results = {}
+    with isolated_storage():
+        for name in args.games:
+            # Games print diagnostics; keep stdout clean for the JSON report
+            with contextlib.redirect_stdout(sys.stderr):
+                results[name] = run_scenario(name, screen, args.frames, args.seed)
+
+    report = {"frames": args.frames, "seed": args.seed, "results": results}
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            f.write(output)
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        for message in regressions:
+            print(f"REGRESSION {message}", file=sys.stderr)
+        if regressions:
+            exit_code = 1
+
+    pygame.quit()
+    return exit_code
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""
+Frame compositor that pushes finished frames to the display
+Screens draw into the back buffer and return the rects they changed
+"""
+import pygame
+import config
+
+MODE_DIRTY = "dirty"
+MODE_FULL = "full"
+
+class Compositor:
+    """Presents frames with pygame.display.update(rects) or a full flip
+
+    Every screen's draw() returns a list of dirty rects, or None when the
+    whole screen changed. The first frame drawn by a new screen is always
+    presented in full, as is any frame after invalidate().
+    """
+
+    def __init__(self, screen, mode=None):
+        self.screen = screen
+        self.mode = mode or config.RENDER_MODE
+        self.screen_rect = screen.get_rect()
+        self.last_source = None
+        self.force_full = True
+        self.frames = 0
+        self.pixels_pushed = 0
+
+    def invalidate(self):
+        """Force the next frame to be presented in full"""
+        self.force_full = True
+
+    def toggle_mode(self):
+        """Switch between dirty-rect and full-flip presentation"""
+        self.mode = MODE_FULL if self.mode == MODE_DIRTY else MODE_DIRTY
+        self.force_full = True
+
+    def needs_present(self, source):
+        """Check if the display must be refreshed even when source reports no change"""
+        return self.force_full or source is not self.last_source
+
+    def present(self, dirty_rects, source=None):
+        """Push the back buffer to the display
+
+        dirty_rects is the value returned by the source's draw(); source is
+        the screen that drew it, so a change of screen triggers a full flip.
+        """
+        if source is not self.last_source:
+            self.last_source = source
+            self.force_full = True
+
+        self.frames += 1
+        if self.mode == MODE_FULL or self.force_full or dirty_rects is None:
+            self.force_full = False
+            self.pixels_pushed += self.screen_rect.width * self.screen_rect.height
+            pygame.display.flip()
+            return
+
+        # Clip to the screen and drop empty rects before handing them to SDL
+        rects = []
+        for rect in dirty_rects:
+            clipped = self.screen_rect.clip(rect)
+            if clipped.width > 0 and clipped.height > 0:
+                rects.append(clipped)
+                self.pixels_pushed += clipped.width * clipped.height
+        if rects:
+            pygame.display.update(rects)
+
+    def average_pixels_per_frame(self):
+        """Average number of pixels pushed to the display per frame"""
+        if self.frames == 0:
+            return 0
+        return self.pixels_pushed / self.frames
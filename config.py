@@ -36,18 +36,62 @@ GRID_SIZE = 20  # Size of each grid cell
 GRID_WIDTH = SCREEN_WIDTH // GRID_SIZE  # 40 cells wide
 GRID_HEIGHT = SCREEN_HEIGHT // GRID_SIZE  # 30 cells tall
 SNAKE_SPEED = 10  # Frames per move (lower = faster)
-FPS = 60
+FPS = 60  # Rendered frames per second cap
+
+# Simulation timing
+GAME_FRAME_RATE = 60  # Game frames per second of play; speeds and gravity are tuned per frame
+SIM_FRAMES_PER_TICK = 1  # Game frames simulated per tick; 2 runs the simulation at 30 Hz on a slow Pi
+SIM_TICK_RATE = GAME_FRAME_RATE // SIM_FRAMES_PER_TICK  # Simulation ticks per second, independent of FPS
+MAX_CATCH_UP_TICKS = 5  # Most ticks simulated for one rendered frame
+
+# High score and leaderboard settings
+PLAYER_NAME = "PLAYER1"  # Name runs are recorded under
+LEADERBOARD_BATCH_SIZE = 32  # Queued runs written per transaction
+LEADERBOARD_RANK_BUCKET = 64  # Score range summed as one row when computing ranks
+LEADERBOARD_BUSY_TIMEOUT = 5.0  # Seconds to wait for another process holding the write lock
+HIGH_SCORE_RECHECK_SECONDS = 1.0  # How often the leaderboard's data_version is polled for outside commits
+PERSISTENCE_QUEUE_SIZE = 256  # Finished runs waiting for the background writer
+PERSISTENCE_MAX_BATCH = 64  # Most queued runs coalesced into one transaction
+PERSISTENCE_SHUTDOWN_TIMEOUT = 5.0  # Seconds to wait for queued runs on exit
+PERSISTENCE_RETRY_DELAY = 0.5  # Seconds before a failed write is retried, doubled on each failure
+PERSISTENCE_RETRY_MAX_DELAY = 30.0  # Longest wait between retries of a failed write
+
+# Idle settings
+IDLE_WAIT_MS = 100  # Longest sleep waiting for input while nothing on screen is animating
+
+# Loading screen settings
+LOADING_MIN_DISPLAY_TIME = 0.3  # Seconds the loading screen stays up even if loading is instant
+
+# Frame profiler settings (F3 toggles the HUD)
+PROFILER_ENABLED = False  # Collect per-phase timings from startup
+PROFILER_WINDOW = 600  # Frames kept per state for rolling percentiles
+PROFILER_EXPORT_DIR = "profiles"  # Where CSV/JSON reports go when the session ends
+
+# Rendering settings
+RENDER_MODE = "dirty"  # "dirty" = update only changed rects, "full" = flip whole frame (F4 switches)
 
 # Flappy Bird settings
 GRAVITY = 0.5  # Gravity strength
 BIRD_JUMP_STRENGTH = 8  # Jump velocity
 GROUND_HEIGHT = 80  # Height of ground
 GROUND_PATTERN_WIDTH = 40  # Width of ground pattern repeat
+PIPE_CAPACITY = 8  # Ring buffer slots for pipe pairs (about 3 are on screen at once)
+
+# Sudoku settings
+SUDOKU_MIN_CLUES = {"easy": 36, "medium": 28, "hard": 22}  # Clues left once the generator stops digging
+SUDOKU_GENERATE_ATTEMPTS = 10  # Solved grids tried before settling for the hardest puzzle found
+SUDOKU_BANK_DIR = "puzzle_bank"  # Pre-generated puzzles, one file per difficulty
+SUDOKU_BANK_TARGET = 20  # Puzzles kept per difficulty
+SUDOKU_BANK_LOW_WATER = 5  # Refilling starts when a difficulty drops below this
+SUDOKU_BANK_WORKERS = 2  # Background generator processes (a Pi 2 has 4 cores), 0 turns refills off
+SUDOKU_BANK_NICENESS = 19  # Nice increment for generator processes
 
 # Font sizes
 FONT_SIZE_LARGE = 48
 FONT_SIZE_MEDIUM = 32
 FONT_SIZE_SMALL = 24
+FONT_SIZE_PENCIL = 16  # Sudoku pencil marks, three to a cell side
+TEXT_CACHE_SIZE = 256  # Rendered text surfaces kept before the least recently used is dropped
 
 # Mario game settings
 MARIO_GRAVITY = 0.8  # Gravity strength for Mario
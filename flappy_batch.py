@@ -0,0 +1,212 @@
+"""
+Vectorized Flappy Bird simulator for evaluating flap policies
+Steps thousands of birds per call with NumPy against one shared pipe course
+"""
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import config
+import flappy_bird
+
+def crossing_times(start, distance, line):
+    """flappy_bird.crossing_time for arrays of moves"""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        times = np.clip((line - start) / distance, 0.0, 1.0)
+    return np.where(distance == 0, 1.0, times)
+
+class FlappyBatch:
+    """Many birds flying the same pipe course, one array entry per bird
+
+    Follows FlappyBird exactly: step(flaps) is a flap key press for the
+    birds flagged in flaps followed by FlappyBird.update(). Pipes only
+    depend on the seed and the frame, so one course serves every bird, and
+    a bird's game stops at its own frame of death just like the
+    interactive game. A batch seeded with s matches FlappyBird(screen,
+    seed=s) fed the same flaps.
+
+    Collisions are swept through the frame as in the game, using the same
+    sprite mask. Pipes are solid rectangles, so the overlap test reads a
+    summed-area table of the mask instead of comparing masks, for all
+    birds at once.
+    """
+
+    def __init__(self, count, seed, bird_image=None, ids=None):
+        self.rng = random.Random(seed)
+        self.ids = np.arange(count) if ids is None else np.asarray(ids)  # Global bird numbers, for policies
+        if bird_image is None:
+            bird_image = flappy_bird.load_bird_image()
+        self.bird_width = bird_image.get_width() if bird_image else flappy_bird.FALLBACK_BIRD_SIZE
+
+        # Summed-area table of the bird mask: table[y, x] counts set pixels above and left of (x, y)
+        mask = flappy_bird.build_bird_mask(bird_image)
+        self.mask_width, self.mask_height = mask.get_size()
+        pixels = np.zeros((self.mask_height, self.mask_width), dtype=np.int32)
+        for y in range(self.mask_height):
+            for x in range(self.mask_width):
+                pixels[y, x] = mask.get_at((x, y))
+        self.mask_table = np.zeros((self.mask_height + 1, self.mask_width + 1), dtype=np.int32)
+        self.mask_table[1:, 1:] = pixels.cumsum(axis=0).cumsum(axis=1)
+        bounds = mask.get_bounding_rects()
+        self.bird_bounds = bounds[0].unionall(bounds[1:]) if bounds else mask.get_rect()
+
+        self.sprite_left = int(flappy_bird.BIRD_X) - self.mask_width // 2
+        self.body_height = config.SCREEN_HEIGHT - config.GROUND_HEIGHT
+
+        # Bird state
+        self.bird_y = np.full(count, float(flappy_bird.BIRD_START_Y))
+        self.bird_velocity = np.zeros(count)
+        self.score = np.zeros(count, dtype=np.int32)
+        self.frame_count = np.zeros(count, dtype=np.int64)
+        self.dead = np.zeros(count, dtype=bool)
+        self.frame_impact = np.full(count, np.nan)  # Fraction of the death frame at which a bird hit
+
+        # Shared course: [x, top height, bottom y, bottom height, passed] per pipe, oldest first
+        self.pipes = []
+        self.pipe_spawn_timer = 0
+        self.spawn_pipe()
+
+    def spawn_pipe(self):
+        """Add a pipe pair at the right edge, drawn from the course's generator"""
+        top_height, bottom_y, bottom_height = flappy_bird.random_pipe_pair(self.rng)
+        self.pipes.append([config.SCREEN_WIDTH, top_height, bottom_y, bottom_height, False])
+
+    def next_pipe(self):
+        """(x, top height, bottom y) of the first pipe the birds have not passed, or None"""
+        for x, top_height, bottom_y, _, passed in self.pipes:
+            if not passed:
+                return x, top_height, bottom_y
+        return None
+
+    def step(self, flaps=None):
+        """Advance every bird by one frame, return the boolean array of birds that died
+
+        flaps marks the birds that press flap before this frame's update.
+        """
+        alive = ~self.dead
+        if flaps is not None:
+            self.bird_velocity[np.asarray(flaps, dtype=bool) & alive] = -config.BIRD_JUMP_STRENGTH
+        died = np.zeros(len(self.dead), dtype=bool)
+        if not alive.any():
+            return died
+
+        # Bird physics
+        start_y = self.bird_y[alive]
+        self.frame_count[alive] += 1
+        self.bird_velocity[alive] += config.GRAVITY
+        self.bird_y[alive] += self.bird_velocity[alive]
+
+        # Move the course; every living bird passes a pipe on the same frame
+        bird_left_edge = flappy_bird.BIRD_X - self.bird_width // 2
+        for pipe in self.pipes:
+            pipe[0] -= flappy_bird.PIPE_SPEED
+            if not pipe[4] and pipe[0] + flappy_bird.PIPE_WIDTH < bird_left_edge:
+                pipe[4] = True
+                self.score[alive] += 1
+        while self.pipes and self.pipes[0][0] + flappy_bird.PIPE_WIDTH <= 0:
+            self.pipes.pop(0)
+        self.pipe_spawn_timer += 1
+        if self.pipe_spawn_timer >= flappy_bird.PIPE_SPAWN_INTERVAL:
+            self.spawn_pipe()
+            self.pipe_spawn_timer = 0
+
+        impact = self.check_collisions(start_y, self.bird_y[alive])
+        died[alive] = ~np.isnan(impact)
+        self.frame_impact[alive] = impact
+        self.dead |= died
+        return died
+
+    def mask_overlap(self, sprite_top, left, top, right, bottom):
+        """Whether each bird's mask has a pixel inside the screen rect left..right, top..bottom"""
+        x0 = np.clip(left - self.sprite_left, 0, self.mask_width)
+        x1 = np.clip(right - self.sprite_left, 0, self.mask_width)
+        y0 = np.clip(top - sprite_top, 0, self.mask_height)
+        y1 = np.clip(bottom - sprite_top, 0, self.mask_height)
+        table = self.mask_table
+        return table[y1, x1] - table[y0, x1] - table[y1, x0] + table[y0, x0] > 0
+
+    def check_collisions(self, start_y, bird_y):
+        """Fraction of the frame at which each bird flying start_y to bird_y hit, NaN if it did not
+
+        The same sweep as FlappyBird.check_collisions and pipe_impact.
+        """
+        half = self.mask_height // 2
+        bounds = self.bird_bounds
+        distance = bird_y - start_y
+        impact = np.full(len(bird_y), np.nan)
+
+        # Ground and ceiling
+        sprite_top = np.trunc(bird_y).astype(np.int64) - half
+        ground_y = config.SCREEN_HEIGHT - config.GROUND_HEIGHT
+        ground = sprite_top + bounds.bottom > ground_y
+        ceiling = ~ground & (sprite_top + bounds.top < 0)
+        impact[ground] = crossing_times(start_y[ground] - half + bounds.bottom, distance[ground], ground_y)
+        impact[ceiling] = crossing_times(start_y[ceiling] - half + bounds.top, distance[ceiling], 0)
+
+        # Pipes near the bird are the same for every bird
+        speed = flappy_bird.PIPE_SPEED
+        overhang = flappy_bird.PIPE_RIM_OVERHANG
+        rim_height = flappy_bird.PIPE_RIM_HEIGHT
+        bird_left = self.sprite_left + bounds.left
+        bird_right = self.sprite_left + bounds.right
+        top_min = np.trunc(np.minimum(start_y, bird_y)).astype(np.int64) - half + bounds.top
+        bottom_max = np.trunc(np.maximum(start_y, bird_y)).astype(np.int64) - half + bounds.bottom
+        samples = np.maximum(1, np.ceil(np.maximum(speed, np.abs(distance))).astype(np.int64))
+        for x, top_height, bottom_y, _, _ in self.pipes:
+            if x + speed + flappy_bird.PIPE_WIDTH + overhang <= bird_left:
+                continue
+            if x - overhang >= bird_right:
+                break
+            pending = ~((top_min >= top_height) & (bottom_max <= bottom_y))
+            for k in range(1, int(samples[pending].max(initial=0)) + 1):
+                pending &= k <= samples
+                if not pending.any():
+                    break
+                n = samples[pending]
+                y = np.where(k == n, bird_y[pending], start_y[pending] + distance[pending] * k / n)
+                top = np.trunc(y).astype(np.int64) - half
+                left = x + speed * (n - k) // n
+                right = left + flappy_bird.PIPE_WIDTH
+                hit = (self.mask_overlap(top, left, top_height - self.body_height, right, top_height) |
+                       self.mask_overlap(top, left - overhang, top_height - rim_height, right + overhang, top_height) |
+                       self.mask_overlap(top, left, bottom_y, right, bottom_y + self.body_height) |
+                       self.mask_overlap(top, left - overhang, bottom_y, right + overhang, bottom_y + rim_height))
+                birds = np.flatnonzero(pending)[hit]
+                impact[birds] = np.fmin(impact[birds], k / n[hit])
+                pending[birds] = False
+        return impact
+
+    def results(self):
+        """Copies of the per-bird outcome arrays"""
+        return {
+            "score": self.score.copy(),
+            "dead": self.dead.copy(),
+            "frame_count": self.frame_count.copy(),
+        }
+
+def _simulate_shard(args):
+    """Process pool worker: fly one shard of birds until they die or frames run out"""
+    ids, seed, frames, policy = args
+    batch = FlappyBatch(len(ids), seed, ids=ids)
+    for _ in range(frames):
+        if batch.dead.all():
+            break
+        batch.step(None if policy is None else policy(batch))
+    return batch.results()
+
+def simulate(count, seed, frames, policy=None, workers=None):
+    """Fly count birds over the course of seed, sharded over processes
+
+    policy(batch) returns the flap flags for a frame; batch.ids tells it
+    which birds the shard holds. It must be picklable (a module-level
+    function) to reach the worker processes. Returns the results()
+    arrays in bird order.
+    """
+    workers = min(workers or os.cpu_count() or 1, max(1, count))
+    jobs = [(ids, seed, frames, policy) for ids in np.array_split(np.arange(count), workers)]
+    if workers == 1:
+        return _simulate_shard(jobs[0])
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        parts = list(pool.map(_simulate_shard, jobs))
+    return {key: np.concatenate([part[key] for part in parts]) for key in parts[0]}
@@ -1,100 +1,172 @@
 """
 Flappy Bird game implementation
 """
+import math
 import pygame
 import random
+from array import array
 import config
+import layer_cache
+import text_cache
 import high_score
 
+# Parallax layers repeat every PARALLAX_WRAP pixels; city_scroll wraps where both the
+# clouds (scrolling at 0.2x) and the skyline line up again
+PARALLAX_WRAP = config.SCREEN_WIDTH + 100
+CITY_SCROLL_WRAP = PARALLAX_WRAP * 5
+HORIZON_Y = config.SCREEN_HEIGHT - config.GROUND_HEIGHT - 5
+CITY_BASE = config.SCREEN_HEIGHT - config.GROUND_HEIGHT - 80  # Bottom of the buildings
+CITY_TOP = CITY_BASE - 70  # Top of the tallest building
+
+# Bird and pipe settings, shared with the flappy_batch simulator
+BIRD_X = config.SCREEN_WIDTH // 4
+# Start bird higher up to account for sprite size, 100 pixels above ground
+BIRD_START_Y = max(config.SCREEN_HEIGHT - config.GROUND_HEIGHT - 100, config.SCREEN_HEIGHT // 2)
+BIRD_MAX_SIZE = 60  # Larger sprites are scaled down to fit
+FALLBACK_BIRD_SIZE = 30  # Size of the circle drawn when the sprite is missing
+PIPE_WIDTH = 60
+PIPE_GAP = 180
+PIPE_SPEED = 3
+PIPE_SPAWN_INTERVAL = 120  # Frames between pipe spawns
+PIPE_GAP_MARGIN = 150  # Closest the gap center gets to the top or the ground
+PIPE_RIM_HEIGHT = 20
+PIPE_RIM_OVERHANG = 4  # How far the rim sticks out on each side of the pipe
+
+# Cloud and building positions within one wrap period
+CLOUD_POSITIONS = [
+    (100, 80), (250, 120), (400, 100), (550, 90), (700, 110),
+    (150, 200), (350, 180), (500, 200), (650, 190)
+]
+CITY_BUILDINGS = [
+    (0, 40), (50, 60), (100, 35), (150, 55), (200, 45),
+    (250, 65), (300, 50), (350, 70), (400, 40), (450, 60),
+    (500, 55), (550, 45), (600, 65), (650, 50), (700, 60), (750, 40)
+]
+
+def load_bird_image():
+    """Load the bird sprite scaled to fit BIRD_MAX_SIZE, None if it cannot be loaded"""
+    try:
+        image = pygame.image.load("characters/flappy_bird_bird.png")
+    except pygame.error as e:
+        print(f"Error loading bird sprite: {e}")
+        return None
+    # Headless users (the batch simulator) have no display to convert for
+    if pygame.display.get_surface() is not None:
+        image = image.convert_alpha()
+    
+    # Scale down if sprite is too large
+    original_width = image.get_width()
+    original_height = image.get_height()
+    if original_width > BIRD_MAX_SIZE or original_height > BIRD_MAX_SIZE:
+        scale_factor = min(BIRD_MAX_SIZE / original_width, BIRD_MAX_SIZE / original_height)
+        image = pygame.transform.scale(image, (int(original_width * scale_factor),
+                                               int(original_height * scale_factor)))
+    return image
+
+def build_bird_mask(bird_image):
+    """Collision mask of the bird sprite, or of the fallback circle when it is None"""
+    if bird_image:
+        return pygame.mask.from_surface(bird_image)
+    # The circle the fallback drawing uses
+    circle = pygame.Surface((FALLBACK_BIRD_SIZE, FALLBACK_BIRD_SIZE), pygame.SRCALPHA)
+    pygame.draw.circle(circle, config.BIRD_YELLOW, (FALLBACK_BIRD_SIZE // 2, FALLBACK_BIRD_SIZE // 2), 15)
+    return pygame.mask.from_surface(circle)
+
+def random_pipe_pair(rng, pipe_gap=PIPE_GAP):
+    """Pick a gap with rng, return (top height, bottom pipe y, bottom height)"""
+    gap_y = rng.randint(PIPE_GAP_MARGIN, config.SCREEN_HEIGHT - config.GROUND_HEIGHT - PIPE_GAP_MARGIN)
+    top_pipe_height = gap_y - pipe_gap // 2
+    bottom_pipe_y = gap_y + pipe_gap // 2
+    bottom_pipe_height = config.SCREEN_HEIGHT - config.GROUND_HEIGHT - bottom_pipe_y
+    return top_pipe_height, bottom_pipe_y, bottom_pipe_height
+
+def crossing_time(start, distance, line):
+    """Fraction of a move from start by distance at which line is reached, clamped to 0..1"""
+    if distance == 0:
+        return 1.0
+    return min(1.0, max(0.0, (line - start) / distance))
+
 class FlappyBird:
-    def __init__(self, screen):
+    multi_frame_update = True  # update(dt) simulates dt frames in one call
+    
+    def __init__(self, screen, seed=None):
         self.screen = screen
+        # Unseeded games draw their seed from the global generator, so random.seed() still applies
+        self.rng = random.Random(random.getrandbits(64) if seed is None else seed)
         self.bird_image = None
         self.load_bird_sprite()
         self.reset_game()
-        self.font_large = None
-        self.font_medium = None
-        self.font_small = None
         self.clock = pygame.time.Clock()
         self.frame_count = 0
     
     def load_bird_sprite(self):
         """Load the bird sprite image"""
-        try:
-            self.bird_image = pygame.image.load("characters/flappy_bird_bird.png").convert_alpha()
-            # Get the actual size of the sprite
-            original_width = self.bird_image.get_width()
-            original_height = self.bird_image.get_height()
-            
-            # Scale down if sprite is too large (max 60x60 pixels)
-            max_size = 60
-            if original_width > max_size or original_height > max_size:
-                scale_factor = min(max_size / original_width, max_size / original_height)
-                new_width = int(original_width * scale_factor)
-                new_height = int(original_height * scale_factor)
-                self.bird_image = pygame.transform.scale(self.bird_image, (new_width, new_height))
-                self.bird_width = new_width
-                self.bird_height = new_height
-            else:
-                self.bird_width = original_width
-                self.bird_height = original_height
-        except pygame.error as e:
-            print(f"Error loading bird sprite: {e}")
+        self.bird_image = load_bird_image()
+        if self.bird_image:
+            self.bird_width = self.bird_image.get_width()
+            self.bird_height = self.bird_image.get_height()
+        else:
             # Fallback to a default size if image can't be loaded
-            self.bird_width = 30
-            self.bird_height = 30
-            self.bird_image = None
+            self.bird_width = FALLBACK_BIRD_SIZE
+            self.bird_height = FALLBACK_BIRD_SIZE
         
-    def initialize_fonts(self):
-        """Initialize fonts"""
-        self.font_large = pygame.font.Font(None, config.FONT_SIZE_LARGE)
-        self.font_medium = pygame.font.Font(None, config.FONT_SIZE_MEDIUM)
-        self.font_small = pygame.font.Font(None, config.FONT_SIZE_SMALL)
-    
     def reset_game(self):
         """Reset the game to initial state"""
         # Bird properties - ensure safe starting position
-        self.bird_x = config.SCREEN_WIDTH // 4
-        # Start bird higher up to account for sprite size, ensure it's well above ground
-        ground_y = config.SCREEN_HEIGHT - config.GROUND_HEIGHT
-        safe_start_y = ground_y - 100  # Start 100 pixels above ground
-        self.bird_y = max(safe_start_y, config.SCREEN_HEIGHT // 2)
+        self.bird_x = BIRD_X
+        self.bird_y = BIRD_START_Y
         self.bird_velocity = 0
+        self.prev_bird_y = self.bird_y
+        # Fraction of a tick between the last two simulated states, set by main
+        self.render_alpha = 1.0
+        self.step_frames = 1  # Frames the last update() covered, what render_alpha spans
         
         # Game state
         self.score = 0
         self.game_over = False
+        self.new_high_score = False  # Whether the finished run beat the previous best
+        self.frame_impact = None  # Fraction of the last frame at which the bird hit something
         self.frame_count = 0
         
-        # Pipes
-        self.pipes = []
-        self.pipe_width = 60
-        self.pipe_gap = 180
-        self.pipe_speed = 3
+        # Pipes live in a fixed ring buffer of parallel arrays, oldest first
+        self.pipe_x = array('i', [0]) * config.PIPE_CAPACITY
+        self.pipe_top_height = array('i', self.pipe_x)
+        self.pipe_bottom_y = array('i', self.pipe_x)
+        self.pipe_bottom_height = array('i', self.pipe_x)
+        self.pipe_passed = bytearray(config.PIPE_CAPACITY)
+        self.pipe_head = 0  # Slot of the oldest pipe
+        self.pipe_count = 0
+        self.pipe_width = PIPE_WIDTH
+        self.pipe_gap = PIPE_GAP
+        self.pipe_speed = PIPE_SPEED
         self.pipe_spawn_timer = 0
-        self.pipe_spawn_interval = 120  # Frames between pipe spawns
+        self.pipe_spawn_interval = PIPE_SPAWN_INTERVAL
         
         # Background scrolling
         self.ground_scroll = 0
         self.city_scroll = 0
         
+        # Masks for pixel-exact collisions
+        self.build_collision_masks()
+        
         # Generate initial pipes
         self.spawn_pipe()
     
     def spawn_pipe(self):
         """Spawn a new pipe pair"""
-        gap_y = random.randint(150, config.SCREEN_HEIGHT - config.GROUND_HEIGHT - 150)
-        top_pipe_height = gap_y - self.pipe_gap // 2
-        bottom_pipe_y = gap_y + self.pipe_gap // 2
-        bottom_pipe_height = config.SCREEN_HEIGHT - config.GROUND_HEIGHT - bottom_pipe_y
-        
-        self.pipes.append({
-            'x': config.SCREEN_WIDTH,
-            'top_height': top_pipe_height,
-            'bottom_y': bottom_pipe_y,
-            'bottom_height': bottom_pipe_height,
-            'passed': False
-        })
+        top_pipe_height, bottom_pipe_y, bottom_pipe_height = random_pipe_pair(self.rng, self.pipe_gap)
+        
+        if self.pipe_count == config.PIPE_CAPACITY:
+            # Only possible with a tiny capacity; recycle the oldest pipe
+            self.pipe_head = (self.pipe_head + 1) % config.PIPE_CAPACITY
+            self.pipe_count -= 1
+        slot = (self.pipe_head + self.pipe_count) % config.PIPE_CAPACITY
+        self.pipe_x[slot] = config.SCREEN_WIDTH
+        self.pipe_top_height[slot] = top_pipe_height
+        self.pipe_bottom_y[slot] = bottom_pipe_y
+        self.pipe_bottom_height[slot] = bottom_pipe_height
+        self.pipe_passed[slot] = 0
+        self.pipe_count += 1
     
     def handle_event(self, event):
         """Handle input events"""
@@ -107,29 +179,49 @@ class FlappyBird:
                 # Jump/flap
                 self.bird_velocity = -config.BIRD_JUMP_STRENGTH
     
-    def update(self):
-        """Update game state"""
+    def update(self, dt=1):
+        """Advance the game by dt frames
+        
+        This is per-frame substepping: the dt frames are simulated one after
+        another, each with its own swept collision check, so the outcome is
+        the same as dt single-frame updates and the cost grows with dt. A
+        lower tick rate saves rendering and loop overhead, not simulation work.
+        """
         if self.game_over:
             return
         
+        self.prev_bird_y = self.bird_y
+        self.step_frames = dt
+        for _ in range(dt):
+            self.advance_frame()
+            if self.game_over:
+                self.new_high_score = high_score.update_high_score(self.score, "flappy_bird", self.frame_count / config.GAME_FRAME_RATE)
+                return
+    
+    def advance_frame(self):
+        """Simulate one frame"""
         self.frame_count += 1
         
         # Update bird physics
+        start_y = self.bird_y
         self.bird_velocity += config.GRAVITY
         self.bird_y += self.bird_velocity
         
-        # Update pipes
-        for pipe in self.pipes:
-            pipe['x'] -= self.pipe_speed
+        # Update pipes in place; nothing is allocated per frame
+        bird_left_edge = self.bird_x - self.bird_width // 2
+        for i in range(self.pipe_count):
+            slot = (self.pipe_head + i) % config.PIPE_CAPACITY
+            self.pipe_x[slot] -= self.pipe_speed
             
             # Check if bird passed the pipe (using bird's left edge)
-            bird_left_edge = self.bird_x - self.bird_width // 2
-            if not pipe['passed'] and pipe['x'] + self.pipe_width < bird_left_edge:
-                pipe['passed'] = True
+            if not self.pipe_passed[slot] and self.pipe_x[slot] + self.pipe_width < bird_left_edge:
+                self.pipe_passed[slot] = 1
                 self.score += 1
         
-        # Remove off-screen pipes
-        self.pipes = [p for p in self.pipes if p['x'] + self.pipe_width > 0]
+        # Remove off-screen pipes; they all move together, so they leave oldest first
+        while self.pipe_count and self.pipe_x[self.pipe_head] + self.pipe_width <= 0:
+            self.pipe_head = (self.pipe_head + 1) % config.PIPE_CAPACITY
+            self.pipe_count -= 1
         
         # Spawn new pipes
         self.pipe_spawn_timer += 1
@@ -139,189 +231,231 @@ class FlappyBird:
         
         # Update background scrolling
         self.ground_scroll = (self.ground_scroll - self.pipe_speed) % config.GROUND_PATTERN_WIDTH
-        self.city_scroll = (self.city_scroll - self.pipe_speed * 0.3) % config.SCREEN_WIDTH
+        self.city_scroll = (self.city_scroll - self.pipe_speed * 0.3) % CITY_SCROLL_WRAP
         
-        # Check collisions
-        self.check_collisions()
+        # Check collisions along the path flown this frame
+        self.check_collisions(start_y)
     
-    def check_collisions(self):
-        """Check for collisions with pipes and ground"""
-        # Use a smaller collision box than the full sprite for more forgiving gameplay
-        # Scale down collision box to 70% of sprite size
-        collision_width = int(self.bird_width * 0.7)
-        collision_height = int(self.bird_height * 0.7)
-        
-        # Ground collision - check bottom edge of collision box
+    def build_collision_masks(self):
+        """Precompute the bird and pipe masks used by check_collisions"""
+        self.bird_mask = build_bird_mask(self.bird_image)
+        # Sizes kept as plain ints so the per-frame checks make no get_size() tuples
+        self.bird_mask_width, self.bird_mask_height = self.bird_mask.get_size()
+        
+        # Box around the opaque pixels, relative to the sprite's top-left corner
+        bounds = self.bird_mask.get_bounding_rects()
+        self.bird_bounds = bounds[0].unionall(bounds[1:]) if bounds else self.bird_mask.get_rect()
+        
+        # Pipes are solid: a column as tall as the playfield and the rim
+        self.pipe_body_height = config.SCREEN_HEIGHT - config.GROUND_HEIGHT
+        self.pipe_body_mask = pygame.mask.Mask((self.pipe_width, self.pipe_body_height), fill=True)
+        self.pipe_rim_mask = pygame.mask.Mask((self.pipe_width + 2 * PIPE_RIM_OVERHANG, PIPE_RIM_HEIGHT), fill=True)
+    
+    def check_collisions(self, start_y):
+        """Sweep the bird from start_y to bird_y against the moving pipes, ground and ceiling
+        
+        On a hit, sets game_over and frame_impact, the fraction of the frame
+        at which the bird first touched. Pipe contact is found by sampling
+        (see pipe_impact), so it is quantised to those samples rather than
+        an exact time of impact.
+        """
+        # Sprite placed as draw_bird centers it, and the box around its opaque pixels
+        mask_height = self.bird_mask_height
+        sprite_left = int(self.bird_x) - self.bird_mask_width // 2
+        bird_left = sprite_left + self.bird_bounds.left
+        bird_right = sprite_left + self.bird_bounds.right
+        distance = self.bird_y - start_y
+        impact = None
+        
+        # Ground and ceiling - the bird moves in a straight line, so if it ends
+        # the frame past one it crossed it once, where the opaque box touches
+        sprite_top = int(self.bird_y) - mask_height // 2
         ground_y = config.SCREEN_HEIGHT - config.GROUND_HEIGHT
-        bird_bottom = self.bird_y + collision_height // 2
-        if bird_bottom >= ground_y:
-            self.game_over = True
-            high_score.update_high_score(self.score, "flappy_bird")
-            return
+        if sprite_top + self.bird_bounds.bottom > ground_y:
+            impact = crossing_time(start_y - mask_height // 2 + self.bird_bounds.bottom, distance, ground_y)
+        elif sprite_top + self.bird_bounds.top < 0:
+            impact = crossing_time(start_y - mask_height // 2 + self.bird_bounds.top, distance, 0)
+        
+        # Pipes - swept box test first, then the masks along the path
+        top_min = int(min(start_y, self.bird_y)) - mask_height // 2 + self.bird_bounds.top
+        bottom_max = int(max(start_y, self.bird_y)) - mask_height // 2 + self.bird_bounds.bottom
+        for i in range(self.pipe_count):
+            slot = (self.pipe_head + i) % config.PIPE_CAPACITY
+            pipe_x = self.pipe_x[slot]
+            # The pipe started the frame pipe_speed pixels further right
+            if pipe_x + self.pipe_speed + self.pipe_width + PIPE_RIM_OVERHANG <= bird_left:
+                continue  # Behind the bird all frame
+            if pipe_x - PIPE_RIM_OVERHANG >= bird_right:
+                break  # This pipe and every newer one are still ahead
+            if top_min >= self.pipe_top_height[slot] and bottom_max <= self.pipe_bottom_y[slot]:
+                continue  # Inside the gap all frame
+            
+            hit = self.pipe_impact(slot, start_y, sprite_left)
+            if hit is not None and (impact is None or hit < impact):
+                impact = hit
         
-        # Ceiling collision - check top edge of collision box
-        bird_top = self.bird_y - collision_height // 2
-        if bird_top <= 0:
+        if impact is not None:
             self.game_over = True
-            high_score.update_high_score(self.score, "flappy_bird")
-            return
-        
-        # Pipe collisions - use smaller collision box
-        bird_rect = pygame.Rect(
-            self.bird_x - collision_width // 2,
-            self.bird_y - collision_height // 2,
-            collision_width,
-            collision_height
-        )
-        
-        for pipe in self.pipes:
-            # Top pipe
-            top_pipe_rect = pygame.Rect(
-                pipe['x'],
-                0,
-                self.pipe_width,
-                pipe['top_height']
-            )
-            
-            # Bottom pipe
-            bottom_pipe_rect = pygame.Rect(
-                pipe['x'],
-                pipe['bottom_y'],
-                self.pipe_width,
-                pipe['bottom_height']
-            )
-            
-            if bird_rect.colliderect(top_pipe_rect) or bird_rect.colliderect(bottom_pipe_rect):
-                self.game_over = True
-                high_score.update_high_score(self.score, "flappy_bird")
-                return
+            self.frame_impact = impact
+    
+    def pipe_impact(self, slot, start_y, sprite_left):
+        """First fraction of the frame at which the bird mask touches a pipe, None if it never does
+        
+        Positions are sampled at least once per pixel moved by the bird or
+        the pipe, so thin rims cannot be skipped; the last sample is the
+        end-of-frame position.
+        """
+        mask_height = self.bird_mask_height
+        body_height = self.pipe_body_height
+        top_height = self.pipe_top_height[slot]
+        bottom_y = self.pipe_bottom_y[slot]
+        distance = self.bird_y - start_y
+        samples = max(1, math.ceil(max(self.pipe_speed, abs(distance))))
+        for k in range(1, samples + 1):
+            bird_y = self.bird_y if k == samples else start_y + distance * k / samples
+            sprite_top = int(bird_y) - mask_height // 2
+            # Pipes move in whole pixels, rounded towards where they started
+            body_x = self.pipe_x[slot] + self.pipe_speed * (samples - k) // samples - sprite_left
+            rim_x = body_x - PIPE_RIM_OVERHANG
+            # Offsets of the top body, top rim, bottom body and bottom rim from the sprite
+            if (self.bird_mask.overlap(self.pipe_body_mask, (body_x, top_height - body_height - sprite_top)) or
+                    self.bird_mask.overlap(self.pipe_rim_mask, (rim_x, top_height - PIPE_RIM_HEIGHT - sprite_top)) or
+                    self.bird_mask.overlap(self.pipe_body_mask, (body_x, bottom_y - sprite_top)) or
+                    self.bird_mask.overlap(self.pipe_rim_mask, (rim_x, bottom_y - sprite_top))):
+                return k / samples
+        return None
     
     def draw_bird(self):
         """Draw the bird using the sprite image"""
+        # Interpolate between the last two ticks so motion stays smooth at any FPS
+        bird_y = self.prev_bird_y + (self.bird_y - self.prev_bird_y) * self.render_alpha
         if self.bird_image:
             # Calculate position to center the sprite at bird_x, bird_y
             bird_rect = self.bird_image.get_rect()
-            bird_rect.center = (int(self.bird_x), int(self.bird_y))
+            bird_rect.center = (int(self.bird_x), int(bird_y))
             self.screen.blit(self.bird_image, bird_rect)
         else:
             # Fallback if sprite couldn't be loaded
-            pygame.draw.circle(self.screen, config.BIRD_YELLOW, (int(self.bird_x), int(self.bird_y)), 15)
+            pygame.draw.circle(self.screen, config.BIRD_YELLOW, (int(self.bird_x), int(bird_y)), 15)
     
-    def draw_pipe(self, x, height, is_top):
-        """Draw a pipe"""
-        if is_top:
-            # Top pipe (extends downward)
-            pipe_rect = pygame.Rect(x, 0, self.pipe_width, height)
-        else:
-            # Bottom pipe (extends upward)
-            pipe_rect = pygame.Rect(x, config.SCREEN_HEIGHT - config.GROUND_HEIGHT - height, self.pipe_width, height)
-        
+    def build_pipe_body(self):
+        """Pipe column as tall as the playfield; pipes show its top or bottom part"""
+        height = config.SCREEN_HEIGHT - config.GROUND_HEIGHT
+        surface = pygame.Surface((self.pipe_width, height))
+        pipe_rect = surface.get_rect()
         # Main pipe body (green)
-        pygame.draw.rect(self.screen, config.PIPE_GREEN, pipe_rect)
-        
+        surface.fill(config.PIPE_GREEN)
         # Darker green outline
-        pygame.draw.rect(self.screen, config.PIPE_DARK_GREEN, pipe_rect, 3)
-        
+        pygame.draw.rect(surface, config.PIPE_DARK_GREEN, pipe_rect, 3)
         # Lighter green highlight on left side
-        highlight_rect = pygame.Rect(x + 2, pipe_rect.y + 2, 8, pipe_rect.height - 4)
-        if is_top:
-            highlight_rect.y = pipe_rect.y + 2
-        else:
-            highlight_rect.y = pipe_rect.y + 2
-        pygame.draw.rect(self.screen, config.PIPE_LIGHT_GREEN, highlight_rect)
-        
-        # Pipe rim (wider at ends)
-        rim_width = self.pipe_width + 8
-        rim_height = 20
-        if is_top:
-            rim_rect = pygame.Rect(x - 4, height - rim_height, rim_width, rim_height)
-        else:
-            rim_rect = pygame.Rect(x - 4, config.SCREEN_HEIGHT - config.GROUND_HEIGHT - height, rim_width, rim_height)
-        
-        pygame.draw.rect(self.screen, config.PIPE_GREEN, rim_rect)
-        pygame.draw.rect(self.screen, config.PIPE_DARK_GREEN, rim_rect, 3)
+        pygame.draw.rect(surface, config.PIPE_LIGHT_GREEN, (2, 2, 8, height - 4))
+        return surface
     
-    def draw_background(self):
-        """Draw the background (sky, clouds, city)"""
-        # Sky (light blue)
-        self.screen.fill(config.SKY_BLUE)
-        
-        # Clouds (white, pixelated)
-        cloud_positions = [
-            (100, 80), (250, 120), (400, 100), (550, 90), (700, 110),
-            (150, 200), (350, 180), (500, 200), (650, 190)
-        ]
-        for x, y in cloud_positions:
-            # Scroll clouds slightly
-            cloud_x = (x - self.city_scroll * 0.2) % (config.SCREEN_WIDTH + 100) - 50
-            # Simple cloud shape (pixelated)
-            pygame.draw.circle(self.screen, config.WHITE, (int(cloud_x), y), 15)
-            pygame.draw.circle(self.screen, config.WHITE, (int(cloud_x) + 10, y), 12)
-            pygame.draw.circle(self.screen, config.WHITE, (int(cloud_x) + 20, y), 15)
-            pygame.draw.circle(self.screen, config.WHITE, (int(cloud_x) + 5, y - 8), 10)
-            pygame.draw.circle(self.screen, config.WHITE, (int(cloud_x) + 15, y - 8), 10)
+    def build_pipe_rim(self):
+        """Pipe rim (wider at ends)"""
+        surface = pygame.Surface((self.pipe_width + 2 * PIPE_RIM_OVERHANG, PIPE_RIM_HEIGHT))
+        surface.fill(config.PIPE_GREEN)
+        pygame.draw.rect(surface, config.PIPE_DARK_GREEN, surface.get_rect(), 3)
+        return surface
+    
+    def draw_pipes(self, pipe_offset):
+        """Draw every pipe pair with one batched blits() call
+        
+        A top pipe shows the upper part of the cached body column, a bottom
+        pipe the lower part; the rim hides the column's other end.
+        """
+        body = layer_cache.get_layer(f"flappy_pipe_body:{self.pipe_width}", self.build_pipe_body)
+        rim = layer_cache.get_layer(f"flappy_pipe_rim:{self.pipe_width}", self.build_pipe_rim)
+        body_height = body.get_height()
+        rim_height = rim.get_height()
+        ground_y = config.SCREEN_HEIGHT - config.GROUND_HEIGHT
         
-        # City skyline (light blue silhouette)
-        city_y = config.SCREEN_HEIGHT - config.GROUND_HEIGHT - 80
-        city_buildings = [
-            (0, 40), (50, 60), (100, 35), (150, 55), (200, 45),
-            (250, 65), (300, 50), (350, 70), (400, 40), (450, 60),
-            (500, 55), (550, 45), (600, 65), (650, 50), (700, 60), (750, 40)
-        ]
-        for i, (base_x, height) in enumerate(city_buildings):
-            city_x = (base_x - self.city_scroll) % (config.SCREEN_WIDTH + 100) - 50
+        blits = []
+        for i in range(self.pipe_count):
+            slot = (self.pipe_head + i) % config.PIPE_CAPACITY
+            x = self.pipe_x[slot] + pipe_offset
+            top_height = self.pipe_top_height[slot]
+            bottom_height = self.pipe_bottom_height[slot]
+            blits.append((body, (x, 0), (0, 0, self.pipe_width, top_height)))
+            blits.append((rim, (x - PIPE_RIM_OVERHANG, top_height - rim_height)))
+            blits.append((body, (x, ground_y - bottom_height),
+                          (0, body_height - bottom_height, self.pipe_width, bottom_height)))
+            blits.append((rim, (x - PIPE_RIM_OVERHANG, ground_y - bottom_height)))
+        self.screen.blits(blits, False)
+    
+    def build_sky_layer(self):
+        """Sky and clouds above the skyline, one wrap period wide"""
+        surface = pygame.Surface((PARALLAX_WRAP, CITY_TOP))
+        surface.fill(config.SKY_BLUE)
+        for x, y in CLOUD_POSITIONS:
+            # Draw each cloud once per neighbouring period too so the layer tiles seamlessly
+            for cloud_x in (x - PARALLAX_WRAP, x, x + PARALLAX_WRAP):
+                # Simple cloud shape (pixelated)
+                pygame.draw.circle(surface, config.WHITE, (cloud_x, y), 15)
+                pygame.draw.circle(surface, config.WHITE, (cloud_x + 10, y), 12)
+                pygame.draw.circle(surface, config.WHITE, (cloud_x + 20, y), 15)
+                pygame.draw.circle(surface, config.WHITE, (cloud_x + 5, y - 8), 10)
+                pygame.draw.circle(surface, config.WHITE, (cloud_x + 15, y - 8), 10)
+        return surface
+    
+    def build_city_layer(self):
+        """City skyline on sky down to the horizon line, one wrap period wide"""
+        surface = pygame.Surface((PARALLAX_WRAP, HORIZON_Y - CITY_TOP))
+        surface.fill(config.SKY_BLUE)
+        city_y = CITY_BASE - CITY_TOP
+        for base_x, height in CITY_BUILDINGS:
             # Building rectangle
-            building_rect = pygame.Rect(
-                int(city_x),
-                city_y - height,
-                30,
-                height
-            )
-            pygame.draw.rect(self.screen, config.CITY_BLUE, building_rect)
+            pygame.draw.rect(surface, config.CITY_BLUE, (base_x, city_y - height, 30, height))
             # Add some windows (darker blue)
             if height > 20:
                 for wy in range(city_y - height + 10, city_y - 5, 15):
-                    for wx in range(int(city_x) + 5, int(city_x) + 25, 10):
-                        pygame.draw.rect(self.screen, config.CITY_DARK_BLUE, (wx, wy, 4, 6))
+                    for wx in range(base_x + 5, base_x + 25, 10):
+                        pygame.draw.rect(surface, config.CITY_DARK_BLUE, (wx, wy, 4, 6))
+        return surface
+    
+    def build_ground_layer(self):
+        """Ground with its striped green border, one pattern width wider than the screen"""
+        pattern_width = config.GROUND_PATTERN_WIDTH
+        surface = pygame.Surface((config.SCREEN_WIDTH + pattern_width, config.GROUND_HEIGHT))
+        # Main ground (light brown)
+        surface.fill(config.GROUND_BROWN)
+        # Green and darker green stripes
+        for stripe_x in range(0, surface.get_width(), 20):
+            color = config.GROUND_GREEN if (stripe_x // 20) % 2 == 0 else config.GROUND_DARK_GREEN
+            pygame.draw.rect(surface, color, (stripe_x, 0, 20, 5))
+        return surface
+    
+    def blit_wrapped(self, layer, scroll, y):
+        """Blit a PARALLAX_WRAP-wide layer scrolled left by scroll pixels, with at most two blits"""
+        # Rounding scroll up puts layer pixels where int() used to put the scrolled shapes
+        x = -50 - math.ceil(scroll) % PARALLAX_WRAP
+        self.screen.blit(layer, (x, y))
+        if x + PARALLAX_WRAP < config.SCREEN_WIDTH:
+            self.screen.blit(layer, (x + PARALLAX_WRAP, y))
+    
+    def draw_background(self):
+        """Draw the background (sky, clouds, city) from pre-rendered layers"""
+        # Clouds scroll slightly, the skyline faster
+        self.blit_wrapped(layer_cache.get_layer("flappy_sky", self.build_sky_layer), self.city_scroll * 0.2, 0)
+        self.blit_wrapped(layer_cache.get_layer("flappy_city", self.build_city_layer), self.city_scroll, CITY_TOP)
         
         # Ground/horizon line (darker green strip)
-        horizon_y = config.SCREEN_HEIGHT - config.GROUND_HEIGHT - 5
-        pygame.draw.rect(self.screen, config.HORIZON_GREEN, 
-                        (0, horizon_y, config.SCREEN_WIDTH, 5))
+        self.screen.fill(config.HORIZON_GREEN, (0, HORIZON_Y, config.SCREEN_WIDTH, 5))
     
     def draw_ground(self):
-        """Draw the ground"""
-        ground_y = config.SCREEN_HEIGHT - config.GROUND_HEIGHT
-        
-        # Main ground (light brown)
-        ground_rect = pygame.Rect(0, ground_y, config.SCREEN_WIDTH, config.GROUND_HEIGHT)
-        self.screen.fill(config.GROUND_BROWN, ground_rect)
-        
-        # Scrolling ground pattern (striped green border)
-        pattern_width = config.GROUND_PATTERN_WIDTH
-        for x in range(-pattern_width, config.SCREEN_WIDTH + pattern_width, pattern_width):
-            pattern_x = (x + self.ground_scroll) % (pattern_width * 2) - pattern_width
-            
-            # Green and darker green stripes
-            for i in range(0, pattern_width, 20):
-                stripe_x = pattern_x + i
-                if 0 <= stripe_x < config.SCREEN_WIDTH:
-                    color = config.GROUND_GREEN if (i // 20) % 2 == 0 else config.GROUND_DARK_GREEN
-                    pygame.draw.rect(self.screen, color, 
-                                   (stripe_x, ground_y, 20, 5))
+        """Draw the ground, scrolled by ground_scroll"""
+        layer = layer_cache.get_layer("flappy_ground", self.build_ground_layer)
+        self.screen.blit(layer, (self.ground_scroll - config.GROUND_PATTERN_WIDTH,
+                                 config.SCREEN_HEIGHT - config.GROUND_HEIGHT))
     
     def draw(self):
-        """Draw the game"""
-        if self.font_medium is None:
-            self.initialize_fonts()
-        
+        """Draw the game, return None since the whole scene scrolls"""
         # Draw background
         self.draw_background()
         
-        # Draw pipes
-        for pipe in self.pipes:
-            self.draw_pipe(pipe['x'], pipe['top_height'], True)
-            self.draw_pipe(pipe['x'], pipe['bottom_height'], False)
+        # Draw pipes, interpolated back towards their previous tick position like the bird
+        pipe_offset = 0 if self.game_over else int(self.pipe_speed * self.step_frames * (1.0 - self.render_alpha))
+        self.draw_pipes(pipe_offset)
         
         # Draw ground
         self.draw_ground()
@@ -331,12 +465,16 @@ class FlappyBird:
             self.draw_bird()
         
         # Draw score (upper right)
-        score_text = self.font_medium.render(str(self.score), True, config.WHITE)
+        score_text = text_cache.render(str(self.score), config.FONT_SIZE_MEDIUM, config.WHITE)
         score_rect = score_text.get_rect()
         score_rect.topright = (config.SCREEN_WIDTH - 10, 10)
         self.screen.blit(score_text, score_rect)
         
-        pygame.display.flip()
+        return None
+    
+    def needs_redraw(self):
+        """The game animates every frame"""
+        return True
     
     def is_game_over(self):
         """Check if game is over"""
@@ -0,0 +1,146 @@
+"""
+Per-phase frame timing for the main loop
+Keeps rolling percentiles per state and game type, draws a HUD and exports reports
+"""
+import csv
+import json
+import os
+import time
+from collections import deque
+import pygame
+import config
+import text_cache
+
+PHASES = ["events", "update", "draw", "present", "tick"]
+
+def percentile(sorted_samples, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, int(fraction * len(sorted_samples)))
+    return sorted_samples[index]
+
+class FrameProfiler:
+    """Times the phases of each frame
+
+    The main loop calls begin_frame(), then mark(phase) after each phase
+    and end_frame() at the end. While disabled every call returns straight
+    away, so the profiler can stay wired into production builds.
+    """
+
+    def __init__(self, enabled=None, window=None):
+        self.enabled = config.PROFILER_ENABLED if enabled is None else enabled
+        self.window = window or config.PROFILER_WINDOW
+        self.show_overlay = False
+        self.samples = {}  # (state, game_type) -> {phase: deque of ms}
+        self.current = None
+        self.frame_start = 0.0
+        self.last_mark = 0.0
+        self.font = None
+
+    def toggle_overlay(self):
+        """Show or hide the HUD; showing it also turns collection on"""
+        self.show_overlay = not self.show_overlay
+        if self.show_overlay:
+            self.enabled = True
+
+    def begin_frame(self, state, game_type=None):
+        """Start timing a frame drawn in the given state"""
+        if not self.enabled:
+            return
+        key = (state, game_type or "-")
+        self.current = self.samples.get(key)
+        if self.current is None:
+            self.current = {phase: deque(maxlen=self.window) for phase in PHASES + ["frame"]}
+            self.samples[key] = self.current
+        self.frame_start = self.last_mark = time.perf_counter()
+
+    def mark(self, phase):
+        """Record the time since the previous mark as the given phase"""
+        if not self.enabled or self.current is None:
+            return
+        now = time.perf_counter()
+        self.current[phase].append((now - self.last_mark) * 1000.0)
+        self.last_mark = now
+
+    def end_frame(self):
+        """Record the whole frame time"""
+        if not self.enabled or self.current is None:
+            return
+        self.current["frame"].append((time.perf_counter() - self.frame_start) * 1000.0)
+        self.current = None
+
+    def summary(self):
+        """Return {(state, game_type): {phase: stats}} for every phase with samples"""
+        result = {}
+        for key, phases in self.samples.items():
+            stats = {}
+            for phase, samples in phases.items():
+                if not samples:
+                    continue
+                ordered = sorted(samples)
+                stats[phase] = {
+                    "count": len(ordered),
+                    "mean": sum(ordered) / len(ordered),
+                    "p50": percentile(ordered, 0.50),
+                    "p95": percentile(ordered, 0.95),
+                    "p99": percentile(ordered, 0.99),
+                }
+            if stats:
+                result[key] = stats
+        return result
+
+    def draw_overlay(self, screen, dirty_rects, state, game_type=None):
+        """Draw the HUD for the current state on top of the frame
+
+        Returns dirty_rects with the HUD area added.
+        """
+        if not self.show_overlay:
+            return dirty_rects
+        if self.font is None:
+            self.font = text_cache.get_font(config.FONT_SIZE_SMALL)
+
+        phases = self.samples.get((state, game_type or "-"), {})
+        lines = ["PHASE     P50    P95    P99 (ms)"]
+        for phase in PHASES + ["frame"]:
+            ordered = sorted(phases.get(phase, ()))
+            lines.append(f"{phase:<8}{percentile(ordered, 0.50):6.2f} "
+                         f"{percentile(ordered, 0.95):6.2f} {percentile(ordered, 0.99):6.2f}")
+
+        line_height = self.font.get_linesize()
+        hud_rect = pygame.Rect(10, config.SCREEN_HEIGHT - 10 - line_height * len(lines) - 8,
+                               300, line_height * len(lines) + 8)
+        screen.fill(config.BLACK, hud_rect)
+        for i, line in enumerate(lines):
+            text = self.font.render(line, True, config.WHITE)
+            screen.blit(text, (hud_rect.x + 4, hud_rect.y + 4 + i * line_height))
+
+        if dirty_rects is None:
+            return None
+        return list(dirty_rects) + [hud_rect]
+
+    def export(self, directory=None):
+        """Write the summary as CSV and JSON, return the written paths"""
+        summary = self.summary()
+        if not summary:
+            return []
+        directory = directory or config.PROFILER_EXPORT_DIR
+        os.makedirs(directory, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        csv_path = os.path.join(directory, f"frame_profile_{stamp}.csv")
+        json_path = os.path.join(directory, f"frame_profile_{stamp}.json")
+
+        with open(csv_path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["state", "game", "phase", "count", "mean_ms", "p50_ms", "p95_ms", "p99_ms"])
+            for (state, game_type), phases in summary.items():
+                for phase, stats in phases.items():
+                    writer.writerow([state, game_type, phase, stats["count"],
+                                     f"{stats['mean']:.3f}", f"{stats['p50']:.3f}",
+                                     f"{stats['p95']:.3f}", f"{stats['p99']:.3f}"])
+
+        with open(json_path, "w") as f:
+            json.dump([{"state": state, "game": game_type, "phases": phases}
+                       for (state, game_type), phases in summary.items()], f, indent=2)
+
+        return [csv_path, json_path]
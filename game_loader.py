@@ -0,0 +1,42 @@
+"""
+Background game loading
+Builds the selected game on a worker thread while the loading screen keeps animating
+"""
+import threading
+import traceback
+
+class GameLoader:
+    """Runs a game factory on a worker thread and tracks its progress
+
+    The factory is called as factory(progress) and returns the game. It may
+    call progress(fraction) with values between 0 and 1 as it goes; the main
+    thread reads self.progress to drive the loading bar.
+    """
+
+    def __init__(self, factory):
+        self.factory = factory
+        self.progress = 0.0
+        self.game = None
+        self.error = None
+        self.done = False
+        self.thread = threading.Thread(target=self._run, name="game-loader", daemon=True)
+
+    def start(self):
+        """Start loading in the background"""
+        self.thread.start()
+
+    def report_progress(self, fraction):
+        """Progress callback handed to the factory"""
+        # Never let the bar go backwards if a factory reports out of order
+        self.progress = max(self.progress, min(fraction, 1.0))
+
+    def _run(self):
+        """Worker thread body"""
+        try:
+            self.game = self.factory(self.report_progress)
+        except Exception as e:
+            self.error = e
+            traceback.print_exc()
+        finally:
+            self.progress = 1.0
+            self.done = True
@@ -3,30 +3,26 @@ Game Over screen with score display and restart options
 """
 import pygame
 import config
+import text_cache
 import high_score
+import layer_cache
 
 class GameOver:
-    def __init__(self, screen, final_score, game_name="snake"):
+    def __init__(self, screen, final_score, game_name="snake", difficulty=None, new_high_score=False):
         self.screen = screen
         self.final_score = final_score
         self.game_name = game_name
-        self.high_score = high_score.load_high_score(game_name)
-        self.new_high_score = final_score > self.high_score
-        if self.new_high_score:
-            self.high_score = final_score
-        self.font_large = None
-        self.font_medium = None
-        self.font_small = None
+        self.difficulty = difficulty
+        # The game has already recorded this run in the leaderboard
+        self.high_score = max(high_score.load_high_score(game_name), final_score)
+        self.rank, self.total_runs = high_score.get_rank(final_score, game_name, difficulty)
+        # Decided by the game when it recorded the run, so tying the old best does not count
+        self.new_high_score = new_high_score
         self.restart_button = None
         self.lobby_button = None
         self.selected_button = 0  # 0 = restart, 1 = lobby
+        self.last_selected_button = None
         
-    def initialize_fonts(self):
-        """Initialize fonts"""
-        self.font_large = pygame.font.Font(None, config.FONT_SIZE_LARGE)
-        self.font_medium = pygame.font.Font(None, config.FONT_SIZE_MEDIUM)
-        self.font_small = pygame.font.Font(None, config.FONT_SIZE_SMALL)
-    
     def handle_event(self, event):
         """Handle input events"""
         if event.type == pygame.KEYDOWN:
@@ -55,35 +51,19 @@ class GameOver:
                 self.selected_button = 1
         return None
     
+    def needs_redraw(self):
+        """Check if the button selection changed since the last drawn frame"""
+        return self.selected_button != self.last_selected_button
+    
     def draw(self):
-        """Draw the game over screen"""
-        if self.font_large is None:
-            self.initialize_fonts()
-        
-        # 1970s style background - dark green with black border
-        self.screen.fill(config.DARK_GREEN)
-        
-        # Add decorative pattern
-        for i in range(0, config.SCREEN_WIDTH + config.SCREEN_HEIGHT, 30):
-            pygame.draw.line(self.screen, (20, 60, 35), 
-                           (i, 0), (i - config.SCREEN_HEIGHT, config.SCREEN_HEIGHT), 1)
-        
-        # Draw borders
-        pygame.draw.rect(self.screen, config.BLACK, (0, 0, config.SCREEN_WIDTH, config.SCREEN_HEIGHT), 10)
-        pygame.draw.rect(self.screen, config.PURPLE, (15, 15, config.SCREEN_WIDTH - 30, config.SCREEN_HEIGHT - 30), 4)
+        """Draw the game over screen, return the dirty rects"""
+        # 1970s style background - dark green with pattern and black border
+        self.screen.blit(layer_cache.retro_background(pattern_spacing=30, border_width=10, inset=15, inset_width=4), (0, 0))
         
         # Game Over text with 1970s style - outlined
-        game_over_text = self.font_large.render("GAME OVER", True, config.PURPLE)
+        game_over_text = text_cache.render("GAME OVER", config.FONT_SIZE_LARGE, config.PURPLE, config.BLACK, 3,
+                                           full_outline=True)
         game_over_rect = game_over_text.get_rect(center=(config.SCREEN_WIDTH // 2, 120))
-        # Draw black outline
-        for dx in [-3, -2, -1, 0, 1, 2, 3]:
-            for dy in [-3, -2, -1, 0, 1, 2, 3]:
-                if dx != 0 or dy != 0:
-                    outline_rect = game_over_rect.copy()
-                    outline_rect.x += dx
-                    outline_rect.y += dy
-                    outline_text = self.font_large.render("GAME OVER", True, config.BLACK)
-                    self.screen.blit(outline_text, outline_rect)
         self.screen.blit(game_over_text, game_over_rect)
         
         # Decorative line
@@ -93,29 +73,28 @@ class GameOver:
         
         # Score display
         score_y = 220
-        score_text = self.font_medium.render(f"SCORE: {self.final_score}", True, config.PURPLE)
+        score_text = text_cache.render(f"SCORE: {self.final_score}", config.FONT_SIZE_MEDIUM, config.PURPLE)
         score_rect = score_text.get_rect(center=(config.SCREEN_WIDTH // 2, score_y))
         self.screen.blit(score_text, score_rect)
         
         # High score display
         high_score_y = score_y + 60
         if self.new_high_score:
-            high_score_text = self.font_medium.render(f"NEW HIGH SCORE: {self.high_score}!", True, config.PURPLE)
-            # Add black outline for emphasis
-            outline_rect = high_score_text.get_rect(center=(config.SCREEN_WIDTH // 2, high_score_y))
-            for dx in [-2, 0, 2]:
-                for dy in [-2, 0, 2]:
-                    if dx != 0 or dy != 0:
-                        outline_pos = outline_rect.copy()
-                        outline_pos.x += dx
-                        outline_pos.y += dy
-                        outline = self.font_medium.render(f"NEW HIGH SCORE: {self.high_score}!", True, config.BLACK)
-                        self.screen.blit(outline, outline_pos)
+            high_score_text = text_cache.render(f"NEW HIGH SCORE: {self.high_score}!", config.FONT_SIZE_MEDIUM, config.PURPLE, config.BLACK, 2)
         else:
-            high_score_text = self.font_medium.render(f"HIGH SCORE: {self.high_score}", True, config.PURPLE)
+            high_score_text = text_cache.render(f"HIGH SCORE: {self.high_score}", config.FONT_SIZE_MEDIUM, config.PURPLE)
         high_score_rect = high_score_text.get_rect(center=(config.SCREEN_WIDTH // 2, high_score_y))
         self.screen.blit(high_score_text, high_score_rect)
         
+        # Leaderboard position of this run
+        if self.total_runs > 0:
+            rank_label = f"RANK #{self.rank} OF {self.total_runs}"
+            if self.difficulty:
+                rank_label += f" ({self.difficulty.upper()})"
+            rank_text = text_cache.render(rank_label, config.FONT_SIZE_SMALL, config.PURPLE)
+            rank_rect = rank_text.get_rect(center=(config.SCREEN_WIDTH // 2, high_score_y + 45))
+            self.screen.blit(rank_text, rank_rect)
+        
         # Buttons with 1970s style
         button_y = high_score_y + 100
         button_width = 220
@@ -138,7 +117,7 @@ class GameOver:
             pygame.draw.rect(self.screen, config.DARK_GREEN, self.restart_button)
             pygame.draw.rect(self.screen, config.PURPLE, self.restart_button, 4)
             text_color = config.PURPLE
-        restart_text = self.font_small.render("RESTART GAME", True, text_color)
+        restart_text = text_cache.render("RESTART GAME", config.FONT_SIZE_SMALL, text_color)
         restart_text_rect = restart_text.get_rect(center=self.restart_button.center)
         self.screen.blit(restart_text, restart_text_rect)
         
@@ -158,9 +137,13 @@ class GameOver:
             pygame.draw.rect(self.screen, config.DARK_GREEN, self.lobby_button)
             pygame.draw.rect(self.screen, config.PURPLE, self.lobby_button, 4)
             text_color = config.PURPLE
-        lobby_text = self.font_small.render("RETURN TO LOBBY", True, text_color)
+        lobby_text = text_cache.render("RETURN TO LOBBY", config.FONT_SIZE_SMALL, text_color)
         lobby_text_rect = lobby_text.get_rect(center=self.lobby_button.center)
         self.screen.blit(lobby_text, lobby_text_rect)
         
-        pygame.display.flip()
+        # Only the button highlight changes between frames
+        if self.selected_button == self.last_selected_button:
+            return []
+        self.last_selected_button = self.selected_button
+        return [self.restart_button.union(self.lobby_button)]
 
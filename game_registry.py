@@ -0,0 +1,91 @@
+"""
+Registry of the available games
+Game modules are imported only when a game is selected, keeping startup fast
+
+Run directly to print the import cost of each game:
+    python game_registry.py
+"""
+import importlib
+import os
+import subprocess
+import sys
+
+class GameInfo:
+    """Display name, module path and factory for one game"""
+
+    def __init__(self, key, display_name, module, class_name, factory=None):
+        self.key = key  # Used for high scores and state routing, e.g. "flappy_bird"
+        self.display_name = display_name  # Shown in the lobby
+        self.module = module
+        self.class_name = class_name
+        self.factory = factory or construct_game
+
+    def load_class(self):
+        """Import the game's module on first use and return its class"""
+        return getattr(importlib.import_module(self.module), self.class_name)
+
+def construct_game(game_class, screen, progress):
+    """Default factory: games that build instantly"""
+    return game_class(screen)
+
+def construct_game_with_progress(game_class, screen, progress):
+    """Factory for games that report their own loading progress"""
+    return game_class(screen, progress)
+
+GAMES = [
+    GameInfo("snake", "SNAKE", "snake_game", "SnakeGame"),
+    GameInfo("flappy_bird", "FLAPPY BIRD", "flappy_bird", "FlappyBird"),
+    GameInfo("sudoku", "SUDOKU", "sudoku_game", "SudokuGame"),
+    GameInfo("mario", "MARIO", "mario_game", "MarioGame", construct_game_with_progress),
+]
+
+_GAMES_BY_KEY = {info.key: info for info in GAMES}
+
+def get_game(key):
+    """Look up a game by key, raising ValueError for unknown games"""
+    try:
+        return _GAMES_BY_KEY[key]
+    except KeyError:
+        raise ValueError(f"Unknown game type: {key}") from None
+
+def create_game(key, screen, progress=None):
+    """Import and construct a game, reporting progress from 0 to 1"""
+    if progress is None:
+        progress = lambda fraction: None
+    info = get_game(key)
+    game_class = info.load_class()
+    progress(0.1)
+    game = info.factory(game_class, screen, progress)
+    progress(1.0)
+    return game
+
+def measure_import_cost(module):
+    """Seconds needed to import a module in a fresh interpreter
+
+    pygame and config are imported first since the lobby already pays for them.
+    """
+    code = ("import time, importlib, pygame, config\n"
+            "start = time.perf_counter()\n"
+            f"importlib.import_module({module!r})\n"
+            "print(time.perf_counter() - start)\n")
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                            env=dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT="1"))
+    if result.returncode != 0:
+        return None
+    return float(result.stdout.strip().splitlines()[-1])
+
+def print_startup_report():
+    """Print how much each game would add to startup if imported eagerly"""
+    total = 0.0
+    print(f"{'GAME':<14}{'MODULE':<16}IMPORT (ms)")
+    for info in GAMES:
+        cost = measure_import_cost(info.module)
+        if cost is None:
+            print(f"{info.key:<14}{info.module:<16}failed")
+            continue
+        total += cost
+        print(f"{info.key:<14}{info.module:<16}{cost * 1000:.1f}")
+    print(f"{'total':<30}{total * 1000:.1f}")
+
+if __name__ == "__main__":
+    print_startup_report()
@@ -1,47 +1,150 @@
 """
 High score persistence system
+Best scores are served from a process-wide in-memory store backed by the
+leaderboard database; finished runs are written there by a background worker
 """
-import json
+import atexit
 import os
+import threading
+import time
+import config
+import leaderboard
+import persistence
 
-HIGH_SCORE_FILE = "high_score.json"
+# Legacy single-value file, migrated into the leaderboard; resolved at import like LEADERBOARD_FILE
+HIGH_SCORE_FILE = os.path.abspath("high_score.json")
+
+class HighScoreStore:
+    """In-memory best score per game, backed by a Leaderboard
+
+    Reads use this store's own connection. Runs are recorded in memory
+    straight away and handed to a PersistenceWorker, which writes them on
+    its own connection, so record() never touches the disk.
+    """
+
+    def __init__(self, board, worker=None):
+        self.leaderboard = board
+        self.worker = worker
+        self.bests = {}
+        self.unsaved = {}  # (game, difficulty) -> runs submitted but not committed yet
+        self.version = None  # Leaderboard data_version when it was last polled
+        self.checked = {}  # game -> data_version its best was last read at
+        self.last_check = None
+        self.lock = threading.Lock()
+
+    def refresh(self, game_name, check_now=False):
+        """Reload a game's best if another connection committed runs since it was read
+
+        The database version is polled at most every
+        HIGH_SCORE_RECHECK_SECONDS unless check_now is set. Only the game
+        asked for is re-read, with one indexed best_score() lookup, so the
+        worker's commits never cost the render thread a full scan.
+        """
+        now = time.monotonic()
+        if check_now or self.last_check is None or now - self.last_check >= config.HIGH_SCORE_RECHECK_SECONDS:
+            self.last_check = now
+            self.version = self.leaderboard.data_version()
+        if self.checked.get(game_name) != self.version:
+            self.checked[game_name] = self.version
+            # Runs still in the worker's queue are only known in memory
+            self.bests[game_name] = max(self.bests.get(game_name, 0), self.leaderboard.best_score(game_name))
+
+    def get(self, game_name):
+        """Return the high score for a game from memory"""
+        with self.lock:
+            self.refresh(game_name)
+            return self.bests.get(game_name, 0)
+
+    def record(self, game_name, score, duration=None, difficulty=None):
+        """Record a finished run, return True if it set a new high score"""
+        with self.lock:
+            self.refresh(game_name)
+            if self.worker is None:
+                self.leaderboard.record_run(game_name, score, duration, difficulty)
+                self.leaderboard.flush()
+            elif self.worker.submit({"game": game_name, "score": score,
+                                     "duration": duration, "difficulty": difficulty}):
+                for key in {(game_name, None), (game_name, difficulty)}:
+                    self.unsaved[key] = self.unsaved.get(key, 0) + 1
+            if score <= self.bests.get(game_name, 0):
+                return False
+            self.bests[game_name] = score
+            return True
+
+    def committed(self, runs):
+        """Worker callback: the given runs are now in the database"""
+        with self.lock:
+            for run in runs:
+                for key in {(run["game"], None), (run["game"], run.get("difficulty"))}:
+                    self.unsaved[key] -= 1
+
+    def rank(self, game_name, score, difficulty=None):
+        """1-based leaderboard position of a score
+
+        Runs still queued are not counted; a run's own score never raises
+        its rank, so this is exact for the run that just finished.
+        """
+        with self.lock:
+            return self.leaderboard.rank(game_name, score, difficulty)
+
+    def run_count(self, game_name, difficulty=None):
+        """Number of recorded runs of a game"""
+        with self.lock:
+            return self.leaderboard.run_count(game_name, difficulty) + self.unsaved.get((game_name, difficulty), 0)
+
+    def flush(self, timeout=None):
+        """Wait until every recorded run is in the database, return False on timeout or a failed write"""
+        return self.worker is None or self.worker.flush(timeout)
+
+    def close(self, timeout=None):
+        """Write queued runs, stop the worker and close the database"""
+        if self.worker is not None:
+            self.worker.shutdown(timeout)
+        self.leaderboard.close()
+
+_store = None
+
+def get_store():
+    """Return the process-wide store, opening the leaderboard on first use"""
+    global _store
+    if _store is None:
+        board = leaderboard.Leaderboard()
+        board.migrate_json(HIGH_SCORE_FILE)
+        _store = HighScoreStore(board)
+        _store.worker = persistence.PersistenceWorker(lambda: leaderboard.Leaderboard(board.path),
+                                                      on_commit=_store.committed)
+        atexit.register(shutdown)
+    return _store
+
+def shutdown(timeout=None):
+    """Write every queued run to disk and close the store; safe to call twice"""
+    global _store
+    if _store is None:
+        return
+    store, _store = _store, None
+    store.close(config.PERSISTENCE_SHUTDOWN_TIMEOUT if timeout is None else timeout)
 
 def load_high_score(game_name="snake"):
-    """Load the high score from file for a specific game, return 0 if file doesn't exist"""
-    if os.path.exists(HIGH_SCORE_FILE):
-        try:
-            with open(HIGH_SCORE_FILE, 'r') as f:
-                data = json.load(f)
-                return data.get(game_name, {}).get('high_score', 0)
-        except (json.JSONDecodeError, IOError):
-            return 0
-    return 0
+    """Return the high score for a specific game, 0 if there is none"""
+    return get_store().get(game_name)
 
 def save_high_score(score, game_name="snake"):
-    """Save the high score to file for a specific game"""
-    try:
-        data = {}
-        if os.path.exists(HIGH_SCORE_FILE):
-            try:
-                with open(HIGH_SCORE_FILE, 'r') as f:
-                    data = json.load(f)
-            except (json.JSONDecodeError, IOError):
-                data = {}
-        
-        if game_name not in data:
-            data[game_name] = {}
-        data[game_name]['high_score'] = score
-        
-        with open(HIGH_SCORE_FILE, 'w') as f:
-            json.dump(data, f)
-    except IOError:
-        pass  # Silently fail if we can't write
-
-def update_high_score(score, game_name="snake"):
-    """Update high score if the new score is higher for a specific game"""
-    current_high = load_high_score(game_name)
-    if score > current_high:
-        save_high_score(score, game_name)
-        return True
-    return False
+    """Record a score for a specific game without waiting for the disk"""
+    get_store().record(game_name, score)
+
+def update_high_score(score, game_name="snake", duration=None, difficulty=None):
+    """Record a finished run, return True if it beat the game's high score
+
+    Never blocks on the disk; the run is written by the persistence worker.
+    Call flush() or shutdown() to wait for it.
+    """
+    return get_store().record(game_name, score, duration, difficulty)
+
+def flush(timeout=None):
+    """Wait until every recorded run is in the database, return False on timeout or a failed write"""
+    return _store is None or _store.flush(timeout)
 
+def get_rank(score, game_name="snake", difficulty=None):
+    """Return (rank, total runs) for a score of a specific game"""
+    store = get_store()
+    return store.rank(game_name, score, difficulty), store.run_count(game_name, difficulty)
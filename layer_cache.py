@@ -0,0 +1,60 @@
+"""
+Cache of pre-rendered static layers
+Menu backgrounds, overlays and game scenery are drawn once per resolution and theme, then blitted
+"""
+import pygame
+import config
+
+# Config colors the cached layers are drawn with; changing any of them rebuilds the layers
+THEME_COLORS = ["DARK_GREEN", "PURPLE", "BLACK", "WHITE", "SKY_BLUE", "CITY_BLUE", "CITY_DARK_BLUE",
+                "GROUND_BROWN", "GROUND_GREEN", "GROUND_DARK_GREEN",
+                "PIPE_GREEN", "PIPE_DARK_GREEN", "PIPE_LIGHT_GREEN"]
+
+PATTERN_COLOR = (20, 60, 35)  # Diagonal line color of the retro backgrounds
+
+_layers = {}  # name -> (key, surface)
+
+def theme_key():
+    """Current screen size and theme colors"""
+    return (config.SCREEN_WIDTH, config.SCREEN_HEIGHT) + tuple(getattr(config, name) for name in THEME_COLORS)
+
+def get_layer(name, builder):
+    """Return the cached layer called name, building it with builder() if stale"""
+    key = theme_key()
+    cached = _layers.get(name)
+    if cached is None or cached[0] != key:
+        surface = builder()
+        # Match the display format so blits are plain copies
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha() if surface.get_flags() & pygame.SRCALPHA else surface.convert()
+        _layers[name] = (key, surface)
+        return surface
+    return cached[1]
+
+def clear():
+    """Drop every cached layer"""
+    _layers.clear()
+
+def retro_background(pattern_spacing=40, border_width=8, inset=10, inset_width=3):
+    """Dark green background with diagonal lines and black/purple borders"""
+    def build():
+        surface = pygame.Surface((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
+        surface.fill(config.DARK_GREEN)
+        for i in range(0, config.SCREEN_WIDTH + config.SCREEN_HEIGHT, pattern_spacing):
+            pygame.draw.line(surface, PATTERN_COLOR,
+                             (i, 0), (i - config.SCREEN_HEIGHT, config.SCREEN_HEIGHT), 1)
+        pygame.draw.rect(surface, config.BLACK, (0, 0, config.SCREEN_WIDTH, config.SCREEN_HEIGHT), border_width)
+        pygame.draw.rect(surface, config.PURPLE,
+                         (inset, inset, config.SCREEN_WIDTH - inset * 2, config.SCREEN_HEIGHT - inset * 2),
+                         inset_width)
+        return surface
+    return get_layer(f"retro_background:{pattern_spacing}:{border_width}:{inset}:{inset_width}", build)
+
+def dim_overlay(alpha=200):
+    """Full-screen black overlay with the given alpha"""
+    def build():
+        surface = pygame.Surface((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
+        surface.fill(config.BLACK)
+        surface.set_alpha(alpha)
+        return surface
+    return get_layer(f"dim_overlay:{alpha}", build)
@@ -0,0 +1,221 @@
+"""
+Leaderboard of every finished run, stored in SQLite (WAL mode)
+Keeps indexed top-N, rank and personal-best queries fast on large histories
+"""
+import json
+import os
+import sqlite3
+import time
+import config
+
+# Resolved at import, before any game changes directory (Mario runs inside its own folder)
+LEADERBOARD_FILE = os.path.abspath("leaderboard.db")
+
+ALL_DIFFICULTIES = "*"  # score_counts row that aggregates every difficulty of a game
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    game TEXT NOT NULL,
+    player TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    duration REAL,
+    difficulty TEXT NOT NULL DEFAULT '',
+    finished_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_game_score ON runs (game, score DESC);
+CREATE INDEX IF NOT EXISTS runs_game_difficulty_score ON runs (game, difficulty, score DESC);
+CREATE INDEX IF NOT EXISTS runs_game_player_score ON runs (game, player, score DESC);
+CREATE TABLE IF NOT EXISTS score_counts (
+    game TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (game, difficulty, score)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS score_buckets (
+    game TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (game, difficulty, bucket)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+class Leaderboard:
+    """Run history for every game
+
+    Runs are queued with record_run() and written in one transaction by
+    flush(). score_counts keeps how many runs reached each score and
+    score_buckets the same per LEADERBOARD_RANK_BUCKET-wide score range, so
+    a rank sums a few buckets plus one bucket's scores instead of scanning
+    runs.
+    Several processes may share the file; writers take the lock with
+    BEGIN IMMEDIATE and wait up to LEADERBOARD_BUSY_TIMEOUT for each other.
+    """
+
+    def __init__(self, path=None):
+        self.path = os.path.abspath(path or LEADERBOARD_FILE)
+        self.pending = []
+        self.connection = sqlite3.connect(self.path, timeout=config.LEADERBOARD_BUSY_TIMEOUT,
+                                          isolation_level=None, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        """Write queued runs and close the database"""
+        self.flush()
+        self.connection.close()
+
+    def run_row(self, game, score, duration=None, difficulty=None, player=None, finished_at=None):
+        """Row of a finished run as record_run() queues it and write_runs() takes it"""
+        return (game, player or config.PLAYER_NAME, int(score), duration,
+                difficulty or "", finished_at or time.time())
+
+    def record_run(self, game, score, duration=None, difficulty=None, player=None, finished_at=None):
+        """Queue a finished run; it is written on the next flush()"""
+        self.pending.append(self.run_row(game, score, duration, difficulty, player, finished_at))
+        if len(self.pending) >= config.LEADERBOARD_BATCH_SIZE:
+            self.flush()
+
+    def flush(self):
+        """Write every queued run in a single transaction
+
+        Runs leave the queue only once they are committed, so when the
+        write fails (e.g. another process keeps the lock past
+        LEADERBOARD_BUSY_TIMEOUT) they stay queued for the next flush().
+        """
+        if not self.pending:
+            return
+        self.write_runs(self.pending)
+        self.pending = []
+
+    def write_runs(self, runs):
+        """Insert run rows in one transaction; on an error nothing is written and it is raised"""
+        cursor = self.connection.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            cursor.executemany("INSERT INTO runs (game, player, score, duration, difficulty, finished_at) "
+                               "VALUES (?, ?, ?, ?, ?, ?)", runs)
+            self._add_counts(cursor, [(game, difficulty, score) for game, _, score, _, difficulty, _ in runs])
+            cursor.execute("COMMIT")
+        except BaseException:
+            cursor.execute("ROLLBACK")
+            raise
+
+    def _add_counts(self, cursor, scores):
+        """Update score_counts and score_buckets for (game, difficulty, score) tuples"""
+        counts = {}
+        buckets = {}
+        for game, difficulty, score in scores:
+            for key in ((game, difficulty), (game, ALL_DIFFICULTIES)):
+                count_key = key + (score,)
+                bucket_key = key + (score // config.LEADERBOARD_RANK_BUCKET,)
+                counts[count_key] = counts.get(count_key, 0) + 1
+                buckets[bucket_key] = buckets.get(bucket_key, 0) + 1
+        cursor.executemany("INSERT INTO score_counts (game, difficulty, score, count) VALUES (?, ?, ?, ?) "
+                           "ON CONFLICT (game, difficulty, score) DO UPDATE SET count = count + excluded.count",
+                           [key + (count,) for key, count in counts.items()])
+        cursor.executemany("INSERT INTO score_buckets (game, difficulty, bucket, count) VALUES (?, ?, ?, ?) "
+                           "ON CONFLICT (game, difficulty, bucket) DO UPDATE SET count = count + excluded.count",
+                           [key + (count,) for key, count in buckets.items()])
+
+    def data_version(self):
+        """Changes whenever another connection commits to the database"""
+        return self.connection.execute("PRAGMA data_version").fetchone()[0]
+
+    def top_scores(self, game, limit=10, difficulty=None):
+        """Best runs as (player, score, duration, difficulty, finished_at), highest first"""
+        if difficulty is None:
+            rows = self.connection.execute(
+                "SELECT player, score, duration, difficulty, finished_at FROM runs "
+                "WHERE game = ? ORDER BY score DESC LIMIT ?", (game, limit))
+        else:
+            rows = self.connection.execute(
+                "SELECT player, score, duration, difficulty, finished_at FROM runs "
+                "WHERE game = ? AND difficulty = ? ORDER BY score DESC LIMIT ?", (game, difficulty, limit))
+        return rows.fetchall()
+
+    def best_score(self, game, difficulty=None):
+        """Highest score for a game, 0 if it has never been played"""
+        row = self.connection.execute(
+            "SELECT MAX(score) FROM score_counts WHERE game = ? AND difficulty = ?",
+            (game, ALL_DIFFICULTIES if difficulty is None else difficulty)).fetchone()
+        return row[0] or 0
+
+    def personal_best(self, game, player=None, difficulty=None):
+        """Highest score a player reached in a game, 0 if none"""
+        player = player or config.PLAYER_NAME
+        if difficulty is None:
+            row = self.connection.execute(
+                "SELECT MAX(score) FROM runs WHERE game = ? AND player = ?", (game, player)).fetchone()
+        else:
+            row = self.connection.execute(
+                "SELECT MAX(score) FROM runs WHERE game = ? AND player = ? AND difficulty = ?",
+                (game, player, difficulty)).fetchone()
+        return row[0] or 0
+
+    def rank(self, game, score, difficulty=None):
+        """1-based position a score holds among all recorded runs"""
+        difficulty = ALL_DIFFICULTIES if difficulty is None else difficulty
+        bucket = score // config.LEADERBOARD_RANK_BUCKET
+        higher_buckets = self.connection.execute(
+            "SELECT COALESCE(SUM(count), 0) FROM score_buckets WHERE game = ? AND difficulty = ? AND bucket > ?",
+            (game, difficulty, bucket)).fetchone()[0]
+        same_bucket = self.connection.execute(
+            "SELECT COALESCE(SUM(count), 0) FROM score_counts "
+            "WHERE game = ? AND difficulty = ? AND score > ? AND score < ?",
+            (game, difficulty, score, (bucket + 1) * config.LEADERBOARD_RANK_BUCKET)).fetchone()[0]
+        return higher_buckets + same_bucket + 1
+
+    def run_count(self, game, difficulty=None):
+        """Number of runs recorded for a game"""
+        row = self.connection.execute(
+            "SELECT COALESCE(SUM(count), 0) FROM score_buckets WHERE game = ? AND difficulty = ?",
+            (game, ALL_DIFFICULTIES if difficulty is None else difficulty)).fetchone()
+        return row[0]
+
+    def migrate_json(self, json_path):
+        """Import the old single-value high_score.json once, then rename it"""
+        if not os.path.exists(json_path):
+            return False
+        try:
+            with open(json_path, 'r') as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, IOError):
+            return False
+
+        cursor = self.connection.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            # Another process may have migrated while we waited for the lock
+            if cursor.execute("SELECT 1 FROM meta WHERE key = 'json_migrated'").fetchone():
+                cursor.execute("COMMIT")
+                return False
+            finished_at = os.path.getmtime(json_path)
+            scores = []
+            for game, entry in data.items():
+                score = entry.get('high_score', 0) if isinstance(entry, dict) else 0
+                if score > 0:
+                    scores.append((game, "", int(score)))
+            cursor.executemany("INSERT INTO runs (game, player, score, duration, difficulty, finished_at) "
+                               "VALUES (?, ?, ?, NULL, ?, ?)",
+                               [(game, config.PLAYER_NAME, score, difficulty, finished_at)
+                                for game, difficulty, score in scores])
+            self._add_counts(cursor, scores)
+            cursor.execute("INSERT INTO meta (key, value) VALUES ('json_migrated', ?)", (json_path,))
+            cursor.execute("COMMIT")
+        except BaseException:
+            cursor.execute("ROLLBACK")
+            raise
+
+        try:
+            os.replace(json_path, json_path + ".migrated")
+        except OSError:
+            pass  # The meta row already stops a second import
+        return True
@@ -3,29 +3,21 @@
 """
 import pygame
 import config
+import text_cache
+import game_registry
+import layer_cache
 
 class Lobby:
     def __init__(self, screen):
         self.screen = screen
         self.selected_index = 0
-        self.games = ["SNAKE", "FLAPPY BIRD", "SUDOKU", "MARIO"]
-        self.font_large = None
-        self.font_medium = None
+        self.games = [info.display_name for info in game_registry.GAMES]
         self.clock = pygame.time.Clock()
         self.scroll_offset = 0  # Track how many items are scrolled up
         self.item_height = 100  # Height of each menu item
         self.item_spacing = 100  # Spacing between items
+        self.last_view = None  # (selected_index, scroll_offset) of the last drawn frame
         
-    def initialize_fonts(self):
-        """Initialize fonts for the lobby"""
-        try:
-            # Try to use a retro-style font, fallback to default
-            self.font_large = pygame.font.Font(None, config.FONT_SIZE_LARGE)
-            self.font_medium = pygame.font.Font(None, config.FONT_SIZE_MEDIUM)
-        except:
-            self.font_large = pygame.font.Font(None, config.FONT_SIZE_LARGE)
-            self.font_medium = pygame.font.Font(None, config.FONT_SIZE_MEDIUM)
-    
     def get_visible_range(self):
         """Calculate which items are visible on screen"""
         # Calculate available space for menu items
@@ -61,8 +53,7 @@ class Lobby:
                 self.selected_index = min(len(self.games) - 1, self.selected_index + 1)
                 self.ensure_selection_visible()
             elif event.key == pygame.K_RETURN or event.key == pygame.K_SPACE:
-                game_name = self.games[self.selected_index].lower().replace(" ", "_")
-                return f"start_game:{game_name}"
+                return f"start_game:{game_registry.GAMES[self.selected_index].key}"
         elif event.type == pygame.MOUSEBUTTONDOWN:
             if event.button == 1:  # Left click
                 mouse_pos = pygame.mouse.get_pos()
@@ -75,8 +66,7 @@ class Lobby:
                     y_pos = start_y + relative_index * self.item_spacing
                     if y_pos <= mouse_pos[1] <= y_pos + 70:
                         self.selected_index = i
-                        game_name = self.games[i].lower().replace(" ", "_")
-                        return f"start_game:{game_name}"
+                        return f"start_game:{game_registry.GAMES[i].key}"
         elif event.type == pygame.MOUSEWHEEL:
             # Handle mouse wheel scrolling
             if event.y > 0:  # Scroll up
@@ -92,41 +82,29 @@ class Lobby:
             self.ensure_selection_visible()
         return None
     
+    def needs_redraw(self):
+        """Check if the menu changed since the last drawn frame"""
+        return (self.selected_index, self.scroll_offset) != self.last_view
+    
+    def get_menu_rect(self):
+        """Screen area covered by the game list and its scroll arrows"""
+        _, _, max_visible = self.get_visible_range()
+        start_y = config.SCREEN_HEIGHT // 2 - 30
+        return pygame.Rect(config.SCREEN_WIDTH // 2 - 190, start_y - 50,
+                           380, max_visible * self.item_spacing + 100)
+    
     def draw(self):
-        """Draw the lobby screen"""
-        # 1970s retro background - dark green with pattern
-        self.screen.fill(config.DARK_GREEN)
-        
-        # Add some 1970s style pattern elements
-        # Draw diagonal lines for retro effect
-        for i in range(0, config.SCREEN_WIDTH + config.SCREEN_HEIGHT, 40):
-            pygame.draw.line(self.screen, (20, 60, 35), 
-                           (i, 0), (i - config.SCREEN_HEIGHT, config.SCREEN_HEIGHT), 1)
-        
-        # Draw decorative borders
-        pygame.draw.rect(self.screen, config.BLACK, (0, 0, config.SCREEN_WIDTH, config.SCREEN_HEIGHT), 8)
-        pygame.draw.rect(self.screen, config.PURPLE, (10, 10, config.SCREEN_WIDTH - 20, config.SCREEN_HEIGHT - 20), 3)
-        
-        # Title
-        if self.font_large is None:
-            self.initialize_fonts()
+        """Draw the lobby screen, return the dirty rects"""
+        # 1970s retro background - dark green with diagonal pattern and borders
+        self.screen.blit(layer_cache.retro_background(), (0, 0))
         
         # Title with 1970s style - outlined text
-        title_text = self.font_large.render("GAME BOY", True, config.PURPLE)
+        title_text = text_cache.render("GAME BOY", config.FONT_SIZE_LARGE, config.PURPLE, config.BLACK, 2)
         title_rect = title_text.get_rect(center=(config.SCREEN_WIDTH // 2, 100))
-        # Draw black outline
-        for dx in [-2, 0, 2]:
-            for dy in [-2, 0, 2]:
-                if dx != 0 or dy != 0:
-                    outline_rect = title_rect.copy()
-                    outline_rect.x += dx
-                    outline_rect.y += dy
-                    outline_text = self.font_large.render("GAME BOY", True, config.BLACK)
-                    self.screen.blit(outline_text, outline_rect)
         self.screen.blit(title_text, title_rect)
         
         # Subtitle
-        subtitle_text = self.font_medium.render("SELECT A GAME", True, config.PURPLE)
+        subtitle_text = text_cache.render("SELECT A GAME", config.FONT_SIZE_MEDIUM, config.PURPLE)
         subtitle_rect = subtitle_text.get_rect(center=(config.SCREEN_WIDTH // 2, 160))
         self.screen.blit(subtitle_text, subtitle_rect)
         
@@ -165,7 +143,7 @@ class Lobby:
                 color = config.PURPLE
             
             # Draw game name
-            game_text = self.font_medium.render(game, True, color)
+            game_text = text_cache.render(game, config.FONT_SIZE_MEDIUM, color)
             game_rect = game_text.get_rect(center=(config.SCREEN_WIDTH // 2, y_pos + 20))
             self.screen.blit(game_text, game_rect)
         
@@ -195,9 +173,14 @@ class Lobby:
         pygame.draw.line(self.screen, config.PURPLE, 
                         (config.SCREEN_WIDTH // 2 - 200, instruction_y - 20), 
                         (config.SCREEN_WIDTH // 2 + 200, instruction_y - 20), 2)
-        instruction_text = self.font_medium.render("PRESS ENTER OR CLICK TO START", True, config.PURPLE)
+        instruction_text = text_cache.render("PRESS ENTER OR CLICK TO START", config.FONT_SIZE_MEDIUM, config.PURPLE)
         instruction_rect = instruction_text.get_rect(center=(config.SCREEN_WIDTH // 2, instruction_y))
         self.screen.blit(instruction_text, instruction_rect)
         
-        pygame.display.flip()
+        # Only the menu changes between frames
+        view = (self.selected_index, self.scroll_offset)
+        if view == self.last_view:
+            return []
+        self.last_view = view
+        return [self.get_menu_rect()]
 
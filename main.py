@@ -4,14 +4,17 @@ Handles game state management and screen transitions
 """
 import pygame
 import sys
+from functools import partial
 import config
 from lobby import Lobby
 from loading_screen import LoadingScreen
-from snake_game import SnakeGame
-from flappy_bird import FlappyBird
-from sudoku_game import SudokuGame
-from mario_game import MarioGame
 from game_over import GameOver
+from compositor import Compositor
+from timestep import FixedTimestep
+from frame_profiler import FrameProfiler
+from game_loader import GameLoader
+import game_registry
+import high_score
 
 # Game states
 STATE_LOBBY = "lobby"
@@ -19,6 +22,17 @@ STATE_LOADING = "loading"
 STATE_GAME = "game"
 STATE_GAME_OVER = "game_over"
 
+def simulate_tick(game):
+    """Run one simulation tick, SIM_FRAMES_PER_TICK game frames"""
+    if getattr(game, "multi_frame_update", False):
+        # The game sweeps every frame of the tick in one call, with the same outcome
+        game.update(config.SIM_FRAMES_PER_TICK)
+        return
+    for _ in range(config.SIM_FRAMES_PER_TICK):
+        game.update()
+        if game.is_game_over():
+            break
+
 def main():
     """Main game loop"""
     # Initialize pygame
@@ -26,6 +40,9 @@ def main():
     screen = pygame.display.set_mode((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
     pygame.display.set_caption("Game Boy Games")
     clock = pygame.time.Clock()
+    compositor = Compositor(screen)
+    timestep = FixedTimestep()
+    profiler = FrameProfiler()
     
     # Initialize game states
     current_state = STATE_LOBBY
@@ -34,15 +51,34 @@ def main():
     current_game = None
     current_game_type = None
     game_over = None
+    loader = None
     
     running = True
+    waited_events = []  # Event that ended an idle wait, handled ahead of the queue
     
     while running:
+        profiler.begin_frame(current_state, current_game_type)
+        
         # Handle events
-        for event in pygame.event.get():
+        events = waited_events + pygame.event.get()
+        waited_events = []
+        for event in events:
             if event.type == pygame.QUIT:
                 running = False
             
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                profiler.toggle_overlay()
+                compositor.invalidate()
+                # Games that repaint incrementally must also cover the HUD area again
+                if current_game and hasattr(current_game, "invalidate"):
+                    current_game.invalidate()
+                continue
+            
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F4:
+                # Switch between dirty-rect and full-flip presentation to compare them live
+                compositor.toggle_mode()
+                continue
+            
             # Route events to current state
             if current_state == STATE_LOBBY:
                 result = lobby.handle_event(event)
@@ -50,6 +86,8 @@ def main():
                     current_game_type = result.split(":")[1]  # Get game type
                     current_state = STATE_LOADING
                     loading_screen.start()
+                    loader = GameLoader(partial(game_registry.create_game, current_game_type, screen))
+                    loader.start()
             
             elif current_state == STATE_LOADING:
                 # Loading screen doesn't handle events, just wait
@@ -66,53 +104,90 @@ def main():
                         current_state = STATE_LOADING
                         loading_screen.start()
                         current_game = None  # Will be recreated after loading
+                        loader = GameLoader(partial(game_registry.create_game, current_game_type, screen))
+                        loader.start()
                     elif result == "return_lobby":
                         current_state = STATE_LOBBY
                         current_game = None
                         current_game_type = None
                         game_over = None
         
+        profiler.mark("events")
+        
         # Update game state
+        drawable = None
         if current_state == STATE_LOADING:
-            loading_screen.draw()
-            if loading_screen.is_complete():
-                current_state = STATE_GAME
-                if current_game_type == "snake":
-                    current_game = SnakeGame(screen)
-                elif current_game_type == "flappy_bird":
-                    current_game = FlappyBird(screen)
-                elif current_game_type == "sudoku":
-                    current_game = SudokuGame(screen)
-                elif current_game_type == "mario":
-                    try:
-                        current_game = MarioGame(screen)
-                    except (ImportError, Exception) as e:
-                        print(f"Error initializing Mario game: {e}")
-                        import traceback
-                        traceback.print_exc()
-                        # Set game_over immediately so we can return to lobby
-                        current_state = STATE_LOBBY
-                        current_game = None
-                        current_game_type = None
+            drawable = loading_screen
+            loading_screen.set_progress(loader.progress)
+            if loader.done and loading_screen.is_complete():
+                if loader.error is None:
+                    current_state = STATE_GAME
+                    current_game = loader.game
+                    timestep.reset()
+                else:
+                    print(f"Error initializing {current_game_type} game: {loader.error}")
+                    # Go straight back to the lobby
+                    current_state = STATE_LOBBY
+                    current_game = None
+                    current_game_type = None
+                loader = None
         
         elif current_state == STATE_GAME:
             if current_game:
-                current_game.update()
-                current_game.draw()
-                if current_game.is_game_over():
-                    current_state = STATE_GAME_OVER
-                    game_over = GameOver(screen, current_game.score, current_game_type)
+                # Run as many fixed simulation ticks as real time calls for
+                ticks, alpha = timestep.advance()
+                for _ in range(ticks):
+                    simulate_tick(current_game)
+                    if current_game.is_game_over():
+                        break
+                if hasattr(current_game, "render_alpha"):
+                    current_game.render_alpha = alpha
+                drawable = current_game
         
         elif current_state == STATE_GAME_OVER:
-            if game_over:
-                game_over.draw()
+            drawable = game_over
         
         elif current_state == STATE_LOBBY:
-            lobby.draw()
+            drawable = lobby
+        profiler.mark("update")
+        
+        # Draw the current screen and push only what changed to the display
+        redraw = drawable is not None and (drawable.needs_redraw() or profiler.show_overlay
+                                           or compositor.needs_present(drawable))
+        if redraw:
+            dirty_rects = drawable.draw()
+            profiler.mark("draw")
+            dirty_rects = profiler.draw_overlay(screen, dirty_rects, current_state, current_game_type)
+            compositor.present(dirty_rects, drawable)
+        profiler.mark("present")
         
-        # Cap frame rate
-        clock.tick(config.FPS)
+        # Switch to the game over screen once the final frame is on screen
+        if current_state == STATE_GAME and current_game and current_game.is_game_over():
+            current_state = STATE_GAME_OVER
+            game_over = GameOver(screen, current_game.score, current_game_type,
+                                 getattr(current_game, "difficulty", None),
+                                 getattr(current_game, "new_high_score", False))
+        
+        if redraw or drawable is None:
+            # Cap frame rate
+            clock.tick(config.FPS)
+        else:
+            # Nothing is animating: sleep until input arrives instead of spinning.
+            # The timestep keeps counting through the wait, so games still get
+            # their ticks (capped at MAX_CATCH_UP_TICKS) while the screen is static
+            event = pygame.event.wait(config.IDLE_WAIT_MS)
+            if event.type != pygame.NOEVENT:
+                waited_events.append(event)
+            clock.tick()
+        profiler.mark("tick")
+        profiler.end_frame()
+    
+    # The session is over; keep its timings if any were collected
+    for path in profiler.export():
+        print(f"Frame profile written to {path}")
     
+    # Wait for the persistence worker to write any runs still queued
+    high_score.shutdown()
     pygame.quit()
     sys.exit()
 
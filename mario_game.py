@@ -38,7 +38,7 @@ except ImportError as e:
     MARIO_AVAILABLE = False
 
 class MarioGame:
-    def __init__(self, screen):
+    def __init__(self, screen, progress=None):
         self.screen = screen
         self.original_screen = screen
         
@@ -59,14 +59,21 @@ class MarioGame:
         if os.path.exists(self.mario_dir):
             os.chdir(self.mario_dir)
         
+        # Report loading progress when built by the background loader
+        if progress is None:
+            progress = lambda fraction: None
+        
         # Initialize game components
         try:
             self.dashboard = Dashboard("./img/font.png", 8, screen)
+            progress(0.2)
             self.sound = Sound()
+            progress(0.4)
             self.level = Level(screen, self.sound, self.dashboard)
             
             # Load first level
             self.level.loadLevel("Level1-1")
+            progress(0.8)
             
             # Create Mario
             self.mario = Mario(0, 0, self.level, screen, self.dashboard, self.sound)
@@ -74,6 +81,7 @@ class MarioGame:
             # Game state
             self.game_over = False
             self.score = 0
+            self.new_high_score = False
             self.keys_pressed = {}
             
             # Override Mario's input to work with our event system
@@ -157,7 +165,7 @@ class MarioGame:
             # Check if game is over
             if self.mario.restart:
                 self.game_over = True
-                high_score.update_high_score(self.score, "mario")
+                self.new_high_score = high_score.update_high_score(self.score, "mario")
         
         except Exception as e:
             print(f"Error updating Mario game: {e}")
@@ -168,9 +176,9 @@ class MarioGame:
             os.chdir(self.original_cwd)
     
     def draw(self):
-        """Draw the game"""
+        """Draw the game, return None since the camera scrolls the whole screen"""
         if self.game_over:
-            return
+            return []
         
         # Change to mario directory for asset access
         if os.path.exists(self.mario_dir):
@@ -197,7 +205,11 @@ class MarioGame:
             # Restore original working directory
             os.chdir(self.original_cwd)
         
-        pygame.display.flip()
+        return None
+    
+    def needs_redraw(self):
+        """The game animates every frame"""
+        return True
     
     def is_game_over(self):
         """Check if game is over"""
@@ -0,0 +1,114 @@
+"""
+Write-behind persistence worker
+Finished runs are handed to a background thread so the game loop never waits on disk
+"""
+import queue
+import threading
+import time
+import traceback
+import config
+
+_STOP = object()  # Queue sentinel that tells the worker to exit
+
+class PersistenceWorker:
+    """Background thread that writes runs to the leaderboard in batches
+
+    submit() never blocks: it puts the run on a bounded queue and returns
+    False (counting the run in self.dropped) only if the queue is full.
+    The worker drains everything queued into one transaction. A write
+    that fails is counted in self.errors and retried with the same runs,
+    waiting PERSISTENCE_RETRY_DELAY and doubling up to
+    PERSISTENCE_RETRY_MAX_DELAY; new runs wait in the queue meanwhile.
+    Runs only count as committed after a real COMMIT, so once flush()
+    returns True every run submitted before the call is on disk.
+    shutdown() flushes and stops the thread.
+    """
+
+    def __init__(self, leaderboard_factory, on_commit=None, maxsize=None):
+        self.leaderboard_factory = leaderboard_factory
+        self.on_commit = on_commit  # Called with the list of runs after each commit
+        self.queue = queue.Queue(maxsize=maxsize or config.PERSISTENCE_QUEUE_SIZE)
+        self.condition = threading.Condition()
+        self.submitted = 0  # Runs accepted by submit()
+        self.committed = 0  # Runs the worker has committed to the database
+        self.dropped = 0
+        self.errors = 0  # Failed writes, each one retried
+        self.thread = threading.Thread(target=self._run, name="persistence", daemon=True)
+        self.thread.start()
+
+    def submit(self, run):
+        """Queue a run dict with keys game, score, duration and difficulty"""
+        with self.condition:
+            try:
+                self.queue.put_nowait(run)
+            except queue.Full:
+                self.dropped += 1
+                return False
+            self.submitted += 1
+            return True
+
+    def flush(self, timeout=None):
+        """Wait until every run submitted so far is committed
+
+        Returns False on timeout, or as soon as a write fails; the worker
+        keeps retrying, so a later flush() can still succeed.
+        """
+        with self.condition:
+            target = self.submitted
+            errors = self.errors
+            self.condition.wait_for(lambda: self.committed >= target or self.errors > errors, timeout)
+            return self.committed >= target
+
+    def shutdown(self, timeout=None):
+        """Write everything still queued and stop the worker"""
+        if not self.thread.is_alive():
+            return
+        # The sentinel may wait for room, but the worker is always draining
+        self.queue.put(_STOP)
+        self.thread.join(timeout)
+
+    def _run(self):
+        """Worker thread body"""
+        board = self.leaderboard_factory()
+        stopping = False
+        while not stopping:
+            runs, stopping = self._take()
+            if not runs:
+                continue
+            # Rows are built once, so a retried run keeps its finish time
+            rows = [board.run_row(run["game"], run["score"], run.get("duration"), run.get("difficulty"))
+                    for run in runs]
+            delay = config.PERSISTENCE_RETRY_DELAY
+            while not self._write(board, rows):
+                time.sleep(delay)
+                delay = min(delay * 2, config.PERSISTENCE_RETRY_MAX_DELAY)
+            if self.on_commit:
+                self.on_commit(runs)
+            with self.condition:
+                self.committed += len(runs)
+                self.condition.notify_all()
+        board.close()
+
+    def _take(self):
+        """Wait for the next runs, return (runs, whether shutdown was requested)"""
+        batch = [self.queue.get()]
+        # Coalesce everything else that is already waiting into the same commit
+        while len(batch) < config.PERSISTENCE_MAX_BATCH:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        runs = [run for run in batch if run is not _STOP]
+        return runs, len(runs) != len(batch)
+
+    def _write(self, board, rows):
+        """Commit rows in one transaction, return False if the write failed"""
+        try:
+            board.write_runs(rows)
+            return True
+        except Exception:
+            traceback.print_exc()
+            with self.condition:
+                self.errors += 1
+                self.condition.notify_all()
+            return False
@@ -0,0 +1,212 @@
+"""
+Vectorized Snake simulator for bots and evaluations
+Steps thousands of boards per call with NumPy, without pygame or a display
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import config
+from snake_engine import MASK64, SPLITMIX_GAMMA, SPLITMIX_MUL1, SPLITMIX_MUL2
+
+# Actions, in the order of the arrow keys SnakeGame.handle_event checks
+NO_INPUT = -1
+UP, DOWN, LEFT, RIGHT = range(4)
+DIRECTION_X = np.array([0, 0, -1, 1])
+DIRECTION_Y = np.array([-1, 1, 0, 0])
+OPPOSITE = np.array([DOWN, UP, RIGHT, LEFT])
+
+_GAMMA = np.uint64(SPLITMIX_GAMMA)
+_MUL1 = np.uint64(SPLITMIX_MUL1)
+_MUL2 = np.uint64(SPLITMIX_MUL2)
+
+class SnakeBatch:
+    """Many Snake boards stepped together, one array row per board
+
+    Follows SnakeGame exactly: step(actions) is a key press (ignored if it
+    reverses the current direction) followed by SnakeGame.update(), with the
+    same frame counter, snake_speed ramp, walls, self-collision and apple
+    growth. Each board mirrors SnakeEngine's free-cell list and SplitMix64
+    state, so a board seeded with s produces the same game as
+    SnakeGame(screen, seed=s) fed the same keys.
+    """
+
+    def __init__(self, seeds, width=None, height=None):
+        self.width = width or config.GRID_WIDTH
+        self.height = height or config.GRID_HEIGHT
+        # Any int is a valid seed, reduced to 64 bits as SplitMix64 does
+        self.rng_state = np.array([int(seed) & MASK64 for seed in seeds], dtype=np.uint64)
+        count = len(self.rng_state)
+        cells = self.width * self.height
+
+        self.occupied = np.zeros((count, cells), dtype=np.uint8)
+        self.free = np.zeros((count, cells), dtype=np.int32)
+        self.free_index = np.zeros((count, cells), dtype=np.int32)
+        self.free_count = np.zeros(count, dtype=np.int32)
+        self.body = np.zeros((count, cells), dtype=np.int32)  # Ring buffer, head at body[head_ptr]
+        self.head_ptr = np.zeros(count, dtype=np.int32)
+        self.length = np.zeros(count, dtype=np.int32)
+        self.apple = np.zeros(count, dtype=np.int32)  # -1 once the board is full
+        self.score = np.zeros(count, dtype=np.int32)
+        self.dead = np.zeros(count, dtype=bool)
+        self.frame_count = np.zeros(count, dtype=np.int64)
+        self.snake_speed = np.zeros(count, dtype=np.float64)
+        self.direction = np.zeros(count, dtype=np.int8)
+        self.next_direction = np.zeros(count, dtype=np.int8)
+        self.reset()
+
+    def reset(self, mask=None):
+        """Start new games on the boards selected by mask (all by default)
+
+        Like SnakeGame.reset_game, the random state carries on, so the
+        next game of a board differs from its first one.
+        """
+        boards = np.arange(len(self.dead)) if mask is None else np.flatnonzero(mask)
+        cells = self.width * self.height
+        self.occupied[boards] = 0
+        self.free[boards] = np.arange(cells, dtype=np.int32)
+        self.free_index[boards] = np.arange(cells, dtype=np.int32)
+        self.free_count[boards] = cells
+        self.head_ptr[boards] = 0
+        self.length[boards] = 0
+        self.score[boards] = 0
+        self.dead[boards] = False
+        self.frame_count[boards] = 0
+        self.snake_speed[boards] = config.SNAKE_SPEED
+        self.direction[boards] = RIGHT
+        self.next_direction[boards] = RIGHT
+
+        center = (self.height // 2) * self.width + self.width // 2
+        self._occupy(boards, np.full(len(boards), center, dtype=np.int32))
+        self._spawn_apple(boards)
+
+    def _occupy(self, boards, cells):
+        """Swap-remove cells from the free lists and push them as new heads"""
+        index = self.free_index[boards, cells]
+        last = self.free[boards, self.free_count[boards] - 1]
+        self.free[boards, index] = last
+        self.free_index[boards, last] = index
+        self.free_index[boards, cells] = -1
+        self.free_count[boards] -= 1
+        self.occupied[boards, cells] = 1
+        self.head_ptr[boards] = (self.head_ptr[boards] - 1) % self.body.shape[1]
+        self.body[boards, self.head_ptr[boards]] = cells
+        self.length[boards] += 1
+
+    def _release_tail(self, boards):
+        """Pop the tail cells and append them to the free lists"""
+        tail = (self.head_ptr[boards] + self.length[boards] - 1) % self.body.shape[1]
+        cells = self.body[boards, tail]
+        self.occupied[boards, cells] = 0
+        self.free_index[boards, cells] = self.free_count[boards]
+        self.free[boards, self.free_count[boards]] = cells
+        self.free_count[boards] += 1
+        self.length[boards] -= 1
+
+    def _spawn_apple(self, boards):
+        """Place a new apple on each board, as SnakeEngine._spawn_apple does"""
+        full = self.free_count[boards] == 0
+        self.apple[boards[full]] = -1
+        self.dead[boards[full]] = True
+
+        # Full boards draw no random number, matching the engine
+        boards = boards[~full]
+        state = self.rng_state[boards] + _GAMMA
+        self.rng_state[boards] = state
+        z = (state ^ (state >> np.uint64(30))) * _MUL1
+        z = (z ^ (z >> np.uint64(27))) * _MUL2
+        z ^= z >> np.uint64(31)
+        pick = ((z >> np.uint64(32)) * self.free_count[boards].astype(np.uint64)) >> np.uint64(32)
+        self.apple[boards] = self.free[boards, pick.astype(np.int64)]
+
+    def step(self, actions=None):
+        """Advance every board by one frame, return (ate, died) boolean arrays
+
+        actions holds one of UP, DOWN, LEFT, RIGHT or NO_INPUT per board.
+        Finished boards stay as they are until reset().
+        """
+        ate = np.zeros(len(self.dead), dtype=bool)
+        died = np.zeros(len(self.dead), dtype=bool)
+        if actions is not None:
+            actions = np.asarray(actions)
+            pressed = (actions >= 0) & (actions != OPPOSITE[self.direction])
+            self.next_direction[pressed] = actions[pressed]
+
+        alive = ~self.dead
+        self.frame_count[alive] += 1
+        boards = np.flatnonzero(alive & (self.frame_count % self.snake_speed.astype(np.int64) == 0))
+        self.direction[boards] = self.next_direction[boards]
+
+        head = self.body[boards, self.head_ptr[boards]]
+        x = head % self.width + DIRECTION_X[self.direction[boards]]
+        y = head // self.width + DIRECTION_Y[self.direction[boards]]
+        wall = (x < 0) | (x >= self.width) | (y < 0) | (y >= self.height)
+        died[boards[wall]] = True
+
+        # The tail still counts as body, as in the engine
+        boards = boards[~wall]
+        cells = (y[~wall] * self.width + x[~wall]).astype(np.int32)
+        hit = self.occupied[boards, cells] == 1
+        died[boards[hit]] = True
+        boards = boards[~hit]
+        cells = cells[~hit]
+
+        self._occupy(boards, cells)
+        eaten = cells == self.apple[boards]
+        eaters = boards[eaten]
+        ate[eaters] = True
+        self.score[eaters] += 1
+        self.snake_speed[eaters] = np.maximum(1.0, self.snake_speed[eaters] - 0.1)
+        self._spawn_apple(eaters)
+        self._release_tail(boards[~eaten])
+
+        died |= self.dead & ate  # The snake filled its board
+        self.dead |= died
+        return ate, died
+
+    def head_positions(self):
+        """(x, y) of every head as an (n, 2) array"""
+        head = self.body[np.arange(len(self.dead)), self.head_ptr]
+        return np.stack([head % self.width, head // self.width], axis=1)
+
+    def apple_positions(self):
+        """(x, y) of every apple as an (n, 2) array, (-1, -1) on full boards"""
+        positions = np.stack([self.apple % self.width, self.apple // self.width], axis=1)
+        positions[self.apple < 0] = -1
+        return positions
+
+    def results(self):
+        """Copies of the per-board outcome arrays"""
+        return {
+            "score": self.score.copy(),
+            "dead": self.dead.copy(),
+            "frame_count": self.frame_count.copy(),
+            "length": self.length.copy(),
+        }
+
+def _simulate_shard(args):
+    """Process pool worker: run one shard of boards to the end"""
+    seeds, frames, policy, width, height = args
+    batch = SnakeBatch(seeds, width, height)
+    for _ in range(frames):
+        if batch.dead.all():
+            break
+        batch.step(None if policy is None else policy(batch))
+    return batch.results()
+
+def simulate(seeds, frames, policy=None, workers=None, width=None, height=None):
+    """Play one game per seed for up to frames frames, sharded over processes
+
+    policy(batch) returns the actions for a frame; it must be picklable
+    (a module-level function) to reach the worker processes. Returns the
+    results() arrays in seed order.
+    """
+    seeds = np.asarray(seeds, dtype=np.uint64)
+    workers = min(workers or os.cpu_count() or 1, max(1, len(seeds)))
+    shards = np.array_split(seeds, workers)
+    jobs = [(shard, frames, policy, width, height) for shard in shards]
+    if workers == 1:
+        return _simulate_shard(jobs[0])
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        parts = list(pool.map(_simulate_shard, jobs))
+    return {key: np.concatenate([part[key] for part in parts]) for key in parts[0]}
@@ -0,0 +1,147 @@
+"""
+Snake simulation without any drawing
+Every tick costs O(1) whatever the board size or snake length
+"""
+import random
+from array import array
+from collections import deque
+
+# Results of SnakeEngine.step()
+MOVED = "moved"
+ATE = "ate"
+DIED = "died"
+
+MASK64 = 0xFFFFFFFFFFFFFFFF
+SPLITMIX_GAMMA = 0x9E3779B97F4A7C15
+SPLITMIX_MUL1 = 0xBF58476D1CE4E5B9
+SPLITMIX_MUL2 = 0x94D049BB133111EB
+
+class SplitMix64:
+    """Small counter-based generator
+
+    Used instead of random.Random so snake_batch can reproduce the exact
+    same apples with NumPy, one generator state per board.
+    """
+
+    def __init__(self, seed):
+        self.state = seed & MASK64
+
+    def next_u64(self):
+        """Next 64-bit output"""
+        self.state = (self.state + SPLITMIX_GAMMA) & MASK64
+        z = self.state
+        z = ((z ^ (z >> 30)) * SPLITMIX_MUL1) & MASK64
+        z = ((z ^ (z >> 27)) * SPLITMIX_MUL2) & MASK64
+        return z ^ (z >> 31)
+
+    def below(self, n):
+        """Integer in [0, n) for n < 2**32, from the high 32 bits of the output"""
+        return ((self.next_u64() >> 32) * n) >> 32
+
+class SnakeEngine:
+    """Snake rules on a width x height grid
+
+    Cells are stored as indexes y * width + x. The body is a deque (head
+    first), occupied marks body cells in a bytearray, and free lists every
+    cell not under the snake; free_index maps a cell to its position in
+    free (or -1) so cells can be swap-removed and an apple picked uniformly
+    in O(1).
+    """
+
+    def __init__(self, width, height, seed=None):
+        self.width = width
+        self.height = height
+        # Unseeded engines draw their seed from the global generator, so random.seed() still applies
+        self.rng = SplitMix64(random.getrandbits(64) if seed is None else seed)
+        self.reset()
+
+    def reset(self):
+        """Put a length 1 snake in the middle of an empty board"""
+        cell_count = self.width * self.height
+        self.occupied = bytearray(cell_count)
+        self.free = list(range(cell_count))
+        self.free_index = array('i', range(cell_count))
+        self.body = deque()
+        self.score = 0
+        self.vacated = None  # Tail cell freed by the last step, if any
+        self.dead = False
+        self._occupy(self.to_cell(self.width // 2, self.height // 2))
+        self.apple = self._spawn_apple()
+
+    def to_cell(self, x, y):
+        """Cell index of a grid position"""
+        return y * self.width + x
+
+    def to_position(self, cell):
+        """Grid position (x, y) of a cell index"""
+        return cell % self.width, cell // self.width
+
+    @property
+    def head(self):
+        """Grid position of the snake's head"""
+        return self.to_position(self.body[0])
+
+    def apple_position(self):
+        """Grid position of the apple, None once the board is full"""
+        return None if self.apple is None else self.to_position(self.apple)
+
+    def body_positions(self):
+        """Grid positions of every segment, head first"""
+        width = self.width
+        return [(cell % width, cell // width) for cell in self.body]
+
+    def _occupy(self, cell):
+        """Add a cell to the front of the body"""
+        index = self.free_index[cell]
+        last = self.free.pop()
+        if last != cell:
+            # Move the last free cell into the hole left by this one
+            self.free[index] = last
+            self.free_index[last] = index
+        self.free_index[cell] = -1
+        self.occupied[cell] = 1
+        self.body.appendleft(cell)
+
+    def _release_tail(self):
+        """Remove the last body cell, return it"""
+        cell = self.body.pop()
+        self.occupied[cell] = 0
+        self.free_index[cell] = len(self.free)
+        self.free.append(cell)
+        return cell
+
+    def _spawn_apple(self):
+        """Pick a uniformly random free cell, None if there is none"""
+        if not self.free:
+            return None
+        return self.free[self.rng.below(len(self.free))]
+
+    def step(self, direction):
+        """Move one cell in direction (dx, dy), return MOVED, ATE or DIED"""
+        self.vacated = None
+        if self.dead:
+            return DIED
+
+        x, y = self.to_position(self.body[0])
+        x += direction[0]
+        y += direction[1]
+        if x < 0 or x >= self.width or y < 0 or y >= self.height:
+            self.dead = True
+            return DIED
+
+        # The tail still counts as body, as it has not moved away yet
+        new_head = y * self.width + x
+        if self.occupied[new_head]:
+            self.dead = True
+            return DIED
+
+        self._occupy(new_head)
+        if new_head == self.apple:
+            self.score += 1
+            self.apple = self._spawn_apple()
+            if self.apple is None:
+                self.dead = True  # The snake fills the board; nothing is left to eat
+            return ATE
+
+        self.vacated = self._release_tail()
+        return MOVED
@@ -2,46 +2,39 @@
 Snake game implementation
 """
 import pygame
-import random
 import config
+import text_cache
 import high_score
+from snake_engine import SnakeEngine, ATE
 
 class SnakeGame:
-    def __init__(self, screen):
+    def __init__(self, screen, seed=None):
         self.screen = screen
+        self.seed = seed
+        self.engine = None
         self.reset_game()
-        self.font_medium = None
-        self.font_small = None
         self.clock = pygame.time.Clock()
         self.frame_count = 0
         
-    def initialize_fonts(self):
-        """Initialize fonts"""
-        self.font_medium = pygame.font.Font(None, config.FONT_SIZE_MEDIUM)
-        self.font_small = pygame.font.Font(None, config.FONT_SIZE_SMALL)
-    
     def reset_game(self):
         """Reset the game to initial state"""
-        # Snake starts with length 1 at center
-        center_x = config.GRID_WIDTH // 2
-        center_y = config.GRID_HEIGHT // 2
-        self.snake = [(center_x, center_y)]
+        # Snake starts with length 1 at center; later games reuse the engine so its random sequence carries on
+        if self.engine is None:
+            self.engine = SnakeEngine(config.GRID_WIDTH, config.GRID_HEIGHT, self.seed)
+        else:
+            self.engine.reset()
         self.direction = (1, 0)  # Moving right initially
         self.next_direction = (1, 0)
-        self.apple = self.generate_apple()
         self.score = 0
         self.game_over = False
+        self.new_high_score = False  # Whether the finished run beat the previous best
         self.frame_count = 0
         self.snake_speed = config.SNAKE_SPEED  # Start with base speed
+        # Incremental rendering state: the persistent board and what it shows
+        self.board = None
+        self.drawn_text = {}  # key -> (string, surface, rect)
+        self.changed_cells = set()  # Cell indexes to repaint on the next draw
         
-    def generate_apple(self):
-        """Generate a new apple position that's not on the snake"""
-        while True:
-            x = random.randint(0, config.GRID_WIDTH - 1)
-            y = random.randint(0, config.GRID_HEIGHT - 1)
-            if (x, y) not in self.snake:
-                return (x, y)
-    
     def handle_event(self, event):
         """Handle input events"""
         if event.type == pygame.KEYDOWN:
@@ -65,77 +58,134 @@ class SnakeGame:
         if self.frame_count % int(self.snake_speed) == 0:
             self.direction = self.next_direction
             
-            # Calculate new head position
-            head_x, head_y = self.snake[0]
-            new_head = (head_x + self.direction[0], head_y + self.direction[1])
-            
-            # Check wall collision
-            if (new_head[0] < 0 or new_head[0] >= config.GRID_WIDTH or
-                new_head[1] < 0 or new_head[1] >= config.GRID_HEIGHT):
-                self.game_over = True
-                # Update high score
-                high_score.update_high_score(self.score, "snake")
-                return
-            
-            # Check self collision
-            if new_head in self.snake:
-                self.game_over = True
-                high_score.update_high_score(self.score)
-                return
-            
-            # Add new head
-            self.snake.insert(0, new_head)
+            # Move the snake; walls, the body and a full board end the game
+            old_apple = self.engine.apple
+            result = self.engine.step(self.direction)
+            self.score = self.engine.score
             
-            # Check if apple eaten
-            if new_head == self.apple:
-                self.score += 1
+            # A move changes at most the new head, the vacated tail and the apple
+            self.changed_cells.add(self.engine.body[0])
+            if self.engine.vacated is not None:
+                self.changed_cells.add(self.engine.vacated)
+            if self.engine.apple != old_apple:
+                self.changed_cells.update(cell for cell in (old_apple, self.engine.apple) if cell is not None)
+            if result == ATE:
                 # Increase speed by 0.1 (decrease snake_speed value to make it faster)
                 self.snake_speed = max(1.0, self.snake_speed - 0.1)  # Minimum speed of 1.0
-                self.apple = self.generate_apple()
-            else:
-                # Remove tail if no apple eaten
-                self.snake.pop()
+            if self.engine.dead:
+                self.game_over = True
+                # Update high score
+                self.new_high_score = high_score.update_high_score(self.score, "snake", self.frame_count / config.GAME_FRAME_RATE)
     
-    def draw(self):
-        """Draw the game"""
-        if self.font_medium is None:
-            self.initialize_fonts()
-        
-        # Draw background
-        self.screen.fill(config.DARK_GREEN)
-        
-        # Draw score and high score at top
-        score_text = self.font_small.render(f"Score: {self.score}", True, config.WHITE)
-        self.screen.blit(score_text, (10, 10))
+    def cell_rect(self, cell):
+        """Screen rect of a cell index"""
+        x, y = self.engine.to_position(cell)
+        return pygame.Rect(x * config.GRID_SIZE, y * config.GRID_SIZE,
+                           config.GRID_SIZE, config.GRID_SIZE)
+    
+    def invalidate(self):
+        """Rebuild the board and repaint the whole screen on the next draw"""
+        self.board = None
+    
+    def text_items(self):
+        """(key, string, anchor, position) of every text on the board"""
+        return [
+            ("score", f"Score: {self.score}", "topleft", (10, 10)),
+            ("high_score", f"High Score: {high_score.load_high_score()}", "topright", (config.SCREEN_WIDTH - 10, 10)),
+        ]
+    
+    def set_text(self, key, string, anchor, position):
+        """Render a text if its string changed, return the area to repaint or None"""
+        previous = self.drawn_text.get(key)
+        if previous is not None and previous[0] == string:
+            return None
+        surface = text_cache.render(string, config.FONT_SIZE_SMALL, config.WHITE)
+        rect = surface.get_rect(**{anchor: position})
+        self.drawn_text[key] = (string, surface, rect)
+        return rect if previous is None else rect.union(previous[2])
+    
+    def draw_segment(self, x, y):
+        """Paint one snake segment on the board"""
+        pygame.draw.rect(self.board, config.PURPLE, 
+                       (x, y, config.GRID_SIZE, config.GRID_SIZE))
+        # Add border for better visibility
+        pygame.draw.rect(self.board, (100, 0, 200), 
+                       (x, y, config.GRID_SIZE, config.GRID_SIZE), 1)
+    
+    def draw_apple(self, x, y):
+        """Paint the apple on the board"""
+        # Draw red rectangle for apple
+        pygame.draw.rect(self.board, (255, 0, 0), 
+                        (x, y, config.GRID_SIZE, config.GRID_SIZE))
+        # Add border for better visibility
+        pygame.draw.rect(self.board, (200, 0, 0), 
+                        (x, y, config.GRID_SIZE, config.GRID_SIZE), 1)
+    
+    def paint_area(self, area):
+        """Repaint part of the board: background, texts, then the cells inside it"""
+        self.board.set_clip(area)
+        self.board.fill(config.DARK_GREEN)
+        for _, surface, rect in self.drawn_text.values():
+            self.board.blit(surface, rect)
         
-        current_high = high_score.load_high_score()
-        high_score_text = self.font_small.render(f"High Score: {current_high}", True, config.WHITE)
-        high_score_rect = high_score_text.get_rect()
-        high_score_rect.topright = (config.SCREEN_WIDTH - 10, 10)
-        self.screen.blit(high_score_text, high_score_rect)
+        # Only the few cells under the area are looked at
+        engine = self.engine
+        size = config.GRID_SIZE
+        for y in range(max(0, area.top // size), min(engine.height, (area.bottom - 1) // size + 1)):
+            for x in range(max(0, area.left // size), min(engine.width, (area.right - 1) // size + 1)):
+                cell = engine.to_cell(x, y)
+                if engine.occupied[cell]:
+                    self.draw_segment(x * size, y * size)
+                elif cell == engine.apple:
+                    self.draw_apple(x * size, y * size)
+        self.board.set_clip(None)
+    
+    def repaint_board(self):
+        """Build the board surface from scratch"""
+        self.board = pygame.Surface(self.screen.get_size()).convert()
+        self.drawn_text = {}
+        for key, string, anchor, position in self.text_items():
+            self.set_text(key, string, anchor, position)
         
-        # Draw snake
-        for segment in self.snake:
-            x = segment[0] * config.GRID_SIZE
-            y = segment[1] * config.GRID_SIZE
-            pygame.draw.rect(self.screen, config.PURPLE, 
-                           (x, y, config.GRID_SIZE, config.GRID_SIZE))
-            # Add border for better visibility
-            pygame.draw.rect(self.screen, (100, 0, 200), 
-                           (x, y, config.GRID_SIZE, config.GRID_SIZE), 1)
+        self.board.fill(config.DARK_GREEN)
+        for _, surface, rect in self.drawn_text.values():
+            self.board.blit(surface, rect)
+        for x, y in self.engine.body_positions():
+            self.draw_segment(x * config.GRID_SIZE, y * config.GRID_SIZE)
+        apple = self.engine.apple_position()
+        if apple is not None:
+            self.draw_apple(apple[0] * config.GRID_SIZE, apple[1] * config.GRID_SIZE)
+        self.changed_cells.clear()
+    
+    def draw(self):
+        """Draw the game, return the dirty rects
         
-        # Draw apple as red rectangle
-        apple_x = self.apple[0] * config.GRID_SIZE
-        apple_y = self.apple[1] * config.GRID_SIZE
+        The board surface persists between frames; only the cells changed
+        since the last draw and texts whose string changed are repainted.
+        """
+        if self.board is None:
+            self.repaint_board()
+            self.screen.blit(self.board, (0, 0))
+            return None
         
-        # Draw red rectangle for apple
-        pygame.draw.rect(self.screen, (255, 0, 0), 
-                        (apple_x, apple_y, config.GRID_SIZE, config.GRID_SIZE))
-        # Add border for better visibility
-        pygame.draw.rect(self.screen, (200, 0, 0), 
-                        (apple_x, apple_y, config.GRID_SIZE, config.GRID_SIZE), 1)
+        dirty_rects = []
+        for key, string, anchor, position in self.text_items():
+            area = self.set_text(key, string, anchor, position)
+            if area is not None:
+                dirty_rects.append(area)
+        for cell in self.changed_cells:
+            dirty_rects.append(self.cell_rect(cell))
+        self.changed_cells.clear()
         
-        pygame.display.flip()
+        for area in dirty_rects:
+            self.paint_area(area)
+        for area in dirty_rects:
+            self.screen.blit(self.board, area, area)
+        return dirty_rects
+    
+    def needs_redraw(self):
+        """The game animates every frame"""
+        return True
     
     def is_game_over(self):
         """Check if game is over"""
@@ -0,0 +1,190 @@
+"""
+On-disk bank of pre-generated Sudoku puzzles
+Starting a game pops a stored puzzle instead of generating one; a
+low-priority process pool tops the bank up in the background
+"""
+import atexit
+import multiprocessing
+import os
+import random
+import signal
+import threading
+import config
+import sudoku_generator
+from sudoku_solver import CELLS
+
+RECORD_SIZE = CELLS  # One ASCII digit per cell, 0 for blanks, no separators
+
+def encode(puzzle):
+    """Fixed-width record of a flat puzzle"""
+    return "".join(str(num) for num in puzzle).encode("ascii")
+
+def decode(record):
+    """Flat puzzle of a record, None if the record is damaged"""
+    if len(record) != RECORD_SIZE or not record.isdigit():
+        return None
+    return [digit - 48 for digit in record]
+
+def _init_worker():
+    """Pool initializer: run at low priority with default signal handling
+
+    Forked workers inherit SDL's SIGTERM handler, which would keep
+    Pool.terminate() from stopping them; Ctrl+C is left to the game.
+    """
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    try:
+        os.nice(config.SUDOKU_BANK_NICENESS)
+    except (AttributeError, OSError):
+        pass  # Not available on this platform
+
+def _generate_record(difficulty, seed):
+    """Pool worker: one new puzzle as a record"""
+    puzzle, _ = sudoku_generator.generate(difficulty, random.Random(seed))
+    return encode(puzzle)
+
+class PuzzleBank:
+    """One file of fixed-width records per difficulty
+
+    A file is a plain array of RECORD_SIZE byte records, so its length
+    gives the count and any record can be read at a fixed offset (or the
+    whole file memory-mapped). take() reads the last record and truncates
+    it away, which is O(1) whatever the bank holds. Only this process
+    writes the files: pool workers return records and the pool's result
+    thread appends them under the lock.
+    """
+
+    def __init__(self, directory=None):
+        # Resolved now, so a later os.chdir() (Mario changes directory) does not move the bank
+        self.directory = os.path.abspath(directory or config.SUDOKU_BANK_DIR)
+        self.lock = threading.Lock()
+        self.pool = None  # Started on the first refill
+        self.in_flight = {difficulty: 0 for difficulty in sudoku_generator.DIFFICULTIES}
+        self.refilling = set()  # Difficulties being topped back up to the target
+        self.closed = False
+
+    def path(self, difficulty):
+        """File holding a difficulty's records"""
+        return os.path.join(self.directory, f"{difficulty}.bank")
+
+    def count(self, difficulty):
+        """Number of whole records stored for a difficulty"""
+        try:
+            return os.path.getsize(self.path(difficulty)) // RECORD_SIZE
+        except OSError:
+            return 0
+
+    def take(self, difficulty):
+        """Remove and return a stored flat puzzle, None if the bank is empty
+
+        Also starts a refill when the bank runs low.
+        """
+        puzzle = None
+        with self.lock:
+            try:
+                with open(self.path(difficulty), "r+b") as bank_file:
+                    # A partial record left by an interrupted append is dropped too
+                    offset = (os.fstat(bank_file.fileno()).st_size // RECORD_SIZE - 1) * RECORD_SIZE
+                    if offset >= 0:
+                        bank_file.seek(offset)
+                        puzzle = decode(bank_file.read(RECORD_SIZE))
+                        bank_file.truncate(offset)
+            except OSError:
+                pass
+        self.replenish()
+        return puzzle
+
+    def add(self, difficulty, record):
+        """Append one record"""
+        with self.lock:
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                with open(self.path(difficulty), "ab") as bank_file:
+                    bank_file.write(record)
+            except OSError:
+                pass  # A bank that cannot be written just stays empty
+
+    def replenish(self):
+        """Queue generation for difficulties that ran below the low-water mark
+
+        A difficulty keeps refilling until it is back at its target. At
+        most SUDOKU_BANK_WORKERS puzzles are in flight at once, emptiest
+        difficulty first; each one that finishes queues the next. The first
+        refill forks the pool, so call this and take() from the main thread.
+        """
+        with self.lock:
+            if self.closed:
+                return
+            stored = {difficulty: self.count(difficulty) for difficulty in self.in_flight}
+            for difficulty in sorted(stored, key=stored.get):
+                if stored[difficulty] < config.SUDOKU_BANK_LOW_WATER:
+                    self.refilling.add(difficulty)
+                elif stored[difficulty] >= config.SUDOKU_BANK_TARGET:
+                    self.refilling.discard(difficulty)
+                if difficulty not in self.refilling:
+                    continue
+                wanted = config.SUDOKU_BANK_TARGET - stored[difficulty] - self.in_flight[difficulty]
+                free = config.SUDOKU_BANK_WORKERS - sum(self.in_flight.values())
+                for _ in range(max(0, min(wanted, free))):
+                    self.submit(difficulty)
+
+    def submit(self, difficulty):
+        """Start generating one puzzle; call with the lock held"""
+        if self.pool is None:
+            self.pool = multiprocessing.Pool(config.SUDOKU_BANK_WORKERS, initializer=_init_worker)
+        # Seeds come from the global generator, so random.seed() still applies
+        seed = random.getrandbits(64)
+        self.in_flight[difficulty] += 1
+        self.pool.apply_async(_generate_record, (difficulty, seed),
+                              callback=lambda record: self.generated(difficulty, record),
+                              error_callback=lambda error: self.failed(difficulty, error))
+
+    def generated(self, difficulty, record):
+        """Pool callback: store a finished record and keep the refill going"""
+        # Stored before it stops counting as in flight, so replenish() never overshoots
+        self.add(difficulty, record)
+        with self.lock:
+            self.in_flight[difficulty] -= 1
+        self.replenish()
+
+    def failed(self, difficulty, error):
+        """Pool error callback: report it and stop refilling that difficulty"""
+        print(f"Error generating {difficulty} sudoku puzzle: {error}")
+        with self.lock:
+            self.in_flight[difficulty] -= 1
+            self.refilling.discard(difficulty)
+
+    def close(self):
+        """Stop the pool at once; puzzles still being generated are dropped"""
+        with self.lock:
+            self.closed = True
+            pool, self.pool = self.pool, None
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+
+_bank = None
+
+def get_bank():
+    """Return the process-wide bank"""
+    global _bank
+    if _bank is None:
+        _bank = PuzzleBank()
+        atexit.register(shutdown)
+    return _bank
+
+def shutdown():
+    """Stop background generation; safe to call twice"""
+    global _bank
+    if _bank is None:
+        return
+    bank, _bank = _bank, None
+    bank.close()
+
+def take(difficulty):
+    """A stored flat puzzle for a difficulty, None if none is ready"""
+    return get_bank().take(difficulty)
+
+def replenish():
+    """Start topping up every difficulty that is running low"""
+    get_bank().replenish()
@@ -0,0 +1,103 @@
+"""
+Sudoku board state with incremental constraint bookkeeping
+Validity and win checks are O(1) lookups instead of row, column and box scans
+"""
+
+SIZE = 9
+BOX_SIZE = 3
+ALL_DIGITS = 0b1111111110  # Bits 1 to 9, one per digit
+
+def box_index(row, col):
+    """Index 0-8 of the 3x3 box holding (row, col), left to right then top to bottom"""
+    return (row // BOX_SIZE) * BOX_SIZE + col // BOX_SIZE
+
+class SudokuBoard:
+    """A 9x9 grid that keeps its own constraint counters up to date
+
+    row_counts[r][d], col_counts[c][d] and box_counts[b][d] count the
+    copies of digit d in each unit, and the matching masks have bit d set
+    while d appears there at least once. empty counts blank cells and
+    duplicates counts the surplus copies of a digit within a unit, so the
+    grid is solved exactly when both are 0.
+
+    grid is a list of rows that can be read directly, but every change
+    must go through set() to keep the counters in step.
+    """
+
+    def __init__(self, rows=None):
+        self.load(rows)
+
+    def load(self, rows=None):
+        """Replace the whole grid (blank when rows is None) and rebuild the counters"""
+        self.grid = [[0] * SIZE for _ in range(SIZE)]
+        self.row_counts = [[0] * (SIZE + 1) for _ in range(SIZE)]
+        self.col_counts = [[0] * (SIZE + 1) for _ in range(SIZE)]
+        self.box_counts = [[0] * (SIZE + 1) for _ in range(SIZE)]
+        self.row_masks = [0] * SIZE
+        self.col_masks = [0] * SIZE
+        self.box_masks = [0] * SIZE
+        self.empty = SIZE * SIZE
+        self.duplicates = 0
+        if rows is not None:
+            for row in range(SIZE):
+                for col in range(SIZE):
+                    self.set(row, col, rows[row][col])
+
+    def _units(self, row, col):
+        """(counts, masks, index) of the row, column and box through a cell"""
+        return ((self.row_counts, self.row_masks, row),
+                (self.col_counts, self.col_masks, col),
+                (self.box_counts, self.box_masks, box_index(row, col)))
+
+    def set(self, row, col, num):
+        """Put num (0 clears) at (row, col), return whether the cell changed"""
+        old = self.grid[row][col]
+        if old == num:
+            return False
+        units = self._units(row, col)
+        if old:
+            bit = 1 << old
+            for counts, masks, index in units:
+                count = counts[index][old] - 1
+                counts[index][old] = count
+                if count:
+                    self.duplicates -= 1
+                else:
+                    masks[index] &= ~bit
+            self.empty += 1
+        if num:
+            bit = 1 << num
+            for counts, masks, index in units:
+                count = counts[index][num] + 1
+                counts[index][num] = count
+                if count > 1:
+                    self.duplicates += 1
+                else:
+                    masks[index] |= bit
+            self.empty -= 1
+        self.grid[row][col] = num
+        return True
+
+    def is_valid(self, row, col):
+        """Whether the number at (row, col) is the only copy in its row, column and box"""
+        num = self.grid[row][col]
+        if num == 0:
+            return True
+        return (self.row_counts[row][num] == 1 and self.col_counts[col][num] == 1
+                and self.box_counts[box_index(row, col)][num] == 1)
+
+    def conflicts(self, row, col, num):
+        """Whether another cell in the row, column or box of (row, col) already holds num"""
+        if num == 0:
+            return False
+        own = 1 if self.grid[row][col] == num else 0
+        return (self.row_counts[row][num] > own or self.col_counts[col][num] > own
+                or self.box_counts[box_index(row, col)][num] > own)
+
+    def used_digits(self, row, col):
+        """Bitmask of the digits already present in the row, column and box of (row, col)"""
+        return self.row_masks[row] | self.col_masks[col] | self.box_masks[box_index(row, col)]
+
+    def is_solved(self):
+        """Whether every cell is filled with no repeated digit in any unit"""
+        return self.empty == 0 and self.duplicates == 0
@@ -0,0 +1,95 @@
+"""
+Incremental Sudoku candidates (pencil marks) and single-step hints
+A cell change only recomputes the changed cell and its 20 peers
+"""
+from sudoku_board import SIZE, ALL_DIGITS
+from sudoku_solver import CELLS, ROW_OF, COL_OF, UNITS, DIGIT_OF_BIT
+
+UNIT_KINDS = ["row"] * SIZE + ["column"] * SIZE + ["box"] * SIZE  # Matches the order of UNITS
+
+# Every cell sharing a unit with a cell, the cell itself included
+NEIGHBORHOOD = [sorted({peer for unit in UNITS if cell in unit for peer in unit}) for cell in range(CELLS)]
+
+class Hint:
+    """A cell that can be filled by a single logical step
+
+    kind is "naked" when digit is the cell's only candidate, or "hidden"
+    when the cell is the only place for digit left in its unit (a row,
+    column or box, named by unit).
+    """
+
+    def __init__(self, row, col, digit, kind, unit=None):
+        self.row = row
+        self.col = col
+        self.digit = digit
+        self.kind = kind
+        self.unit = unit
+
+    def describe(self):
+        """Short explanation for the screen"""
+        if self.kind == "naked":
+            return f"ONLY {self.digit} FITS THE MARKED CELL"
+        return f"{self.digit} HAS ONE PLACE LEFT IN ITS {self.unit.upper()}"
+
+class CandidateEngine:
+    """Candidate bitmask of every cell of a SudokuBoard
+
+    candidates[row * 9 + col] has bit d set when d is not yet used in the
+    cell's row, column or box; filled cells have none. Call update() after
+    every board.set() and reset() after board.load().
+    """
+
+    def __init__(self, board):
+        self.board = board
+        self.reset()
+
+    def reset(self):
+        """Recompute every cell"""
+        self.candidates = [self.compute(cell) for cell in range(CELLS)]
+
+    def compute(self, cell):
+        """Candidate mask of one cell from the board's unit masks"""
+        row, col = ROW_OF[cell], COL_OF[cell]
+        if self.board.grid[row][col]:
+            return 0
+        return ALL_DIGITS & ~self.board.used_digits(row, col)
+
+    def update(self, row, col):
+        """Refresh the cells affected by a change at (row, col)"""
+        candidates = self.candidates
+        compute = self.compute
+        for cell in NEIGHBORHOOD[row * SIZE + col]:
+            candidates[cell] = compute(cell)
+
+    def get(self, row, col):
+        """Candidate mask of (row, col)"""
+        return self.candidates[row * SIZE + col]
+
+    def naked_single(self):
+        """Hint for the first cell with exactly one candidate, None if there is none"""
+        for cell, mask in enumerate(self.candidates):
+            if mask and mask & (mask - 1) == 0:
+                return Hint(ROW_OF[cell], COL_OF[cell], DIGIT_OF_BIT[mask], "naked")
+        return None
+
+    def hidden_single(self):
+        """Hint for the first digit with a single possible cell in a unit, None if there is none"""
+        candidates = self.candidates
+        for index, unit in enumerate(UNITS):
+            once = 0
+            twice = 0
+            for cell in unit:
+                twice |= once & candidates[cell]
+                once |= candidates[cell]
+            singles = once & ~twice
+            if not singles:
+                continue
+            bit = singles & -singles
+            for cell in unit:
+                if candidates[cell] & bit:
+                    return Hint(ROW_OF[cell], COL_OF[cell], DIGIT_OF_BIT[bit], "hidden", UNIT_KINDS[index])
+        return None
+
+    def find_hint(self):
+        """Easiest available hint: a naked single, else a hidden single, else None"""
+        return self.naked_single() or self.hidden_single()
@@ -2,39 +2,52 @@
 Sudoku game implementation
 """
 import pygame
-import random
 import config
+import text_cache
 import high_score
+import layer_cache
 import time
+from sudoku_board import SudokuBoard
+from sudoku_solver import to_rows, solve
+import sudoku_generator
+import sudoku_bank
+from sudoku_candidates import CandidateEngine
 
 class SudokuGame:
     def __init__(self, screen):
         self.screen = screen
         self.reset_game()
-        self.font_large = None
-        self.font_medium = None
-        self.font_small = None
         self.clock = pygame.time.Clock()
         self.start_time = None
         self.elapsed_time = 0
         self.paused = False
+        # What the last frame put on screen, used to compute dirty rects
+        self.drawn_view = None
+        self.drawn_cells = {}
+        self.drawn_text = {}
+        self.redraw_requested = True
+        # The bank refill starts from update(): __init__ runs on the loader thread,
+        # and the generator pool must be forked from the main thread
+        self.bank_refill_started = False
         
-    def initialize_fonts(self):
-        """Initialize fonts"""
-        self.font_large = pygame.font.Font(None, config.FONT_SIZE_LARGE)
-        self.font_medium = pygame.font.Font(None, config.FONT_SIZE_MEDIUM)
-        self.font_small = pygame.font.Font(None, config.FONT_SIZE_SMALL)
-    
     def reset_game(self):
         """Reset the game to initial state"""
-        self.grid = [[0 for _ in range(9)] for _ in range(9)]
+        # grid is the board's own list of rows; changes go through board.set()
+        self.board = SudokuBoard()
+        self.grid = self.board.grid
+        self.candidates = CandidateEngine(self.board)
         self.original_grid = [[0 for _ in range(9)] for _ in range(9)]
+        self.solution = None  # Solved grid rows of the current puzzle
+        self.show_candidates = False  # Pencil marks in empty cells, toggled with C
+        self.hint = None  # Hint shown until the board changes, requested with H
+        self.hint_message = None
         self.selected_row = 0
         self.selected_col = 0
         self.difficulty = "medium"  # Default difficulty
         self.game_over = False
         self.won = False
         self.score = 0
+        self.new_high_score = False  # Whether the finished run beat the previous best
         self.start_time = None
         self.elapsed_time = 0
         self.paused = False
@@ -44,127 +57,69 @@ class SudokuGame:
         # Generate puzzle after difficulty is selected
         # Will be called from handle_event when difficulty is chosen
     
-    def generate_solved_puzzle(self):
-        """Generate a valid solved Sudoku puzzle"""
-        # Start with a valid base pattern
-        base = [
-            [1, 2, 3, 4, 5, 6, 7, 8, 9],
-            [4, 5, 6, 7, 8, 9, 1, 2, 3],
-            [7, 8, 9, 1, 2, 3, 4, 5, 6],
-            [2, 3, 4, 5, 6, 7, 8, 9, 1],
-            [5, 6, 7, 8, 9, 1, 2, 3, 4],
-            [8, 9, 1, 2, 3, 4, 5, 6, 7],
-            [3, 4, 5, 6, 7, 8, 9, 1, 2],
-            [6, 7, 8, 9, 1, 2, 3, 4, 5],
-            [9, 1, 2, 3, 4, 5, 6, 7, 8]
-        ]
-        
-        # Shuffle rows within each 3x3 block
-        for block in range(3):
-            rows = list(range(block * 3, block * 3 + 3))
-            random.shuffle(rows)
-            base[block*3:(block+1)*3] = [base[r] for r in rows]
-        
-        # Shuffle columns within each 3x3 block
-        for block in range(3):
-            cols = list(range(block * 3, block * 3 + 3))
-            random.shuffle(cols)
-            for row in base:
-                row[block*3:(block+1)*3] = [row[c] for c in cols]
-        
-        # Random swaps of rows/columns between blocks
-        for _ in range(10):
-            if random.random() < 0.5:
-                # Swap two rows in different blocks
-                block1 = random.randint(0, 2)
-                block2 = random.randint(0, 2)
-                if block1 != block2:
-                    row1 = random.randint(0, 2) + block1 * 3
-                    row2 = random.randint(0, 2) + block2 * 3
-                    base[row1], base[row2] = base[row2], base[row1]
-            else:
-                # Swap two columns in different blocks
-                block1 = random.randint(0, 2)
-                block2 = random.randint(0, 2)
-                if block1 != block2:
-                    col1 = random.randint(0, 2) + block1 * 3
-                    col2 = random.randint(0, 2) + block2 * 3
-                    for row in base:
-                        row[col1], row[col2] = row[col2], row[col1]
-        
-        return base
-    
     def generate_puzzle(self, difficulty):
         """Generate a Sudoku puzzle with given difficulty"""
-        # Generate a solved puzzle
-        solved = self.generate_solved_puzzle()
-        
-        # Copy to grid
-        self.grid = [row[:] for row in solved]
-        self.original_grid = [row[:] for row in solved]
-        
-        # Determine how many cells to remove based on difficulty
-        if difficulty == "easy":
-            cells_to_remove = random.randint(40, 45)
-        elif difficulty == "medium":
-            cells_to_remove = random.randint(30, 35)
-        else:  # hard
-            cells_to_remove = random.randint(20, 25)
-        
-        # Remove cells randomly
-        cells = [(i, j) for i in range(9) for j in range(9)]
-        random.shuffle(cells)
-        
-        for i, (row, col) in enumerate(cells):
-            if i >= cells_to_remove:
-                break
-            self.grid[row][col] = 0
-            self.original_grid[row][col] = 0
+        # Pre-generated puzzles start instantly; only an empty bank generates one here
+        puzzle = sudoku_bank.take(difficulty)
+        # The bank stores puzzles only; solving one takes milliseconds
+        solution = solve(puzzle) if puzzle is not None else None
+        if solution is None:
+            puzzle, solution = sudoku_generator.generate(difficulty)
+        self.solution = to_rows(solution)
+        self.board.load(to_rows(puzzle))
+        self.grid = self.board.grid
+        self.candidates.reset()
+        self.original_grid = to_rows(puzzle)
+    
+    def set_cell(self, num):
+        """Put num (0 clears) in the selected cell and refresh the candidates around it"""
+        if self.board.set(self.selected_row, self.selected_col, num):
+            self.candidates.update(self.selected_row, self.selected_col)
+            self.hint = None
+            self.hint_message = None
+    
+    def request_hint(self):
+        """Find a hint and move the selection onto its cell"""
+        # Hints reason from the numbers on the board, so they mean nothing while some clash
+        if self.board.duplicates:
+            self.hint = None
+            self.hint_message = "FIX THE RED NUMBERS FIRST"
+            return
+        # A wrong number that clashes with nothing would lead hints away from the solution
+        wrong = self.wrong_cell()
+        if wrong is not None:
+            self.hint = None
+            self.hint_message = "THE SELECTED NUMBER IS WRONG"
+            self.selected_row, self.selected_col = wrong
+            return
+        self.hint = self.candidates.find_hint()
+        if self.hint is None:
+            self.hint_message = "NO SINGLE-STEP HINT LEFT"
+            return
+        self.hint_message = self.hint.describe()
+        self.selected_row, self.selected_col = self.hint.row, self.hint.col
+    
+    def wrong_cell(self):
+        """(row, col) of the first filled-in number that differs from the solution, None if there is none"""
+        for row in range(9):
+            for col in range(9):
+                num = self.grid[row][col]
+                if num and not self.original_grid[row][col] and num != self.solution[row][col]:
+                    return row, col
+        return None
     
     def is_valid_move(self, row, col, num):
         """Check if placing num at (row, col) is valid"""
-        if num == 0:
-            return True  # Clearing is always valid
-        
-        # Check row
-        for c in range(9):
-            if c != col and self.grid[row][c] == num:
-                return False
-        
-        # Check column
-        for r in range(9):
-            if r != row and self.grid[r][col] == num:
-                return False
-        
-        # Check 3x3 box
-        box_row = (row // 3) * 3
-        box_col = (col // 3) * 3
-        for r in range(box_row, box_row + 3):
-            for c in range(box_col, box_col + 3):
-                if (r != row or c != col) and self.grid[r][c] == num:
-                    return False
-        
-        return True
+        return not self.board.conflicts(row, col, num)
     
     def check_win(self):
         """Check if the puzzle is complete and correct"""
-        # Check if all cells are filled
-        for row in range(9):
-            for col in range(9):
-                if self.grid[row][col] == 0:
-                    return False
-        
-        # Check if all cells are valid
-        for row in range(9):
-            for col in range(9):
-                num = self.grid[row][col]
-                if not self.is_valid_move(row, col, num):
-                    return False
-        
-        return True
+        return self.board.is_solved()
     
     def handle_event(self, event):
         """Handle input events"""
+        if event.type == pygame.KEYDOWN:
+            self.redraw_requested = True
         if self.show_difficulty_menu:
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_UP:
@@ -176,7 +131,7 @@ class SudokuGame:
                     self.difficulty = difficulties[self.difficulty_selected]
                     self.generate_puzzle(self.difficulty)
                     self.show_difficulty_menu = False
-                    self.start_time = time.time()
+                    self.start_time = time.monotonic()
             return
         
         if self.game_over or self.won:
@@ -195,26 +150,32 @@ class SudokuGame:
                               pygame.K_6, pygame.K_7, pygame.K_8, pygame.K_9]:
                 # Only allow input if cell is not an original clue
                 if self.original_grid[self.selected_row][self.selected_col] == 0:
-                    num = int(event.unicode)
-                    if self.is_valid_move(self.selected_row, self.selected_col, num):
-                        self.grid[self.selected_row][self.selected_col] = num
-                    else:
-                        # Still place it but mark as invalid (will show in red)
-                        self.grid[self.selected_row][self.selected_col] = num
+                    num = event.key - pygame.K_0
+                    # Invalid numbers are still placed and shown in red
+                    self.set_cell(num)
             elif event.key == pygame.K_BACKSPACE or event.key == pygame.K_DELETE:
                 # Only allow clearing if cell is not an original clue
                 if self.original_grid[self.selected_row][self.selected_col] == 0:
-                    self.grid[self.selected_row][self.selected_col] = 0
+                    self.set_cell(0)
+            elif event.key == pygame.K_c:
+                self.show_candidates = not self.show_candidates
+            elif event.key == pygame.K_h:
+                self.request_hint()
     
     def update(self):
         """Update game state"""
+        if not self.bank_refill_started:
+            # Top up the puzzle bank while the player is still choosing a difficulty
+            self.bank_refill_started = True
+            sudoku_bank.replenish()
+        
         if self.show_difficulty_menu or self.game_over or self.won:
             return
         
         if not self.paused and self.start_time:
-            self.elapsed_time = time.time() - self.start_time
+            self.elapsed_time = time.monotonic() - self.start_time
         
-        # Check for win condition
+        # Check for win condition (the board keeps its counters up to date)
         if self.check_win():
             self.won = True
             self.game_over = True
@@ -226,41 +187,20 @@ class SudokuGame:
             max_time = 3600  # 1 hour max
             time_score = max(0, max_time - int(self.elapsed_time))
             self.score = time_score * difficulty_multiplier[self.difficulty]
-            high_score.update_high_score(self.score, "sudoku")
+            self.new_high_score = high_score.update_high_score(self.score, "sudoku", self.elapsed_time, self.difficulty)
     
     def draw_difficulty_menu(self):
         """Draw the difficulty selection menu"""
-        if self.font_medium is None:
-            self.initialize_fonts()
-        
-        # Background
-        self.screen.fill(config.DARK_GREEN)
-        
-        # Decorative pattern
-        for i in range(0, config.SCREEN_WIDTH + config.SCREEN_HEIGHT, 40):
-            pygame.draw.line(self.screen, (20, 60, 35), 
-                           (i, 0), (i - config.SCREEN_HEIGHT, config.SCREEN_HEIGHT), 1)
-        
-        # Borders
-        pygame.draw.rect(self.screen, config.BLACK, (0, 0, config.SCREEN_WIDTH, config.SCREEN_HEIGHT), 8)
-        pygame.draw.rect(self.screen, config.PURPLE, (10, 10, config.SCREEN_WIDTH - 20, config.SCREEN_HEIGHT - 20), 3)
+        # Background with decorative pattern and borders
+        self.screen.blit(layer_cache.retro_background(), (0, 0))
         
         # Title
-        title_text = self.font_large.render("SUDOKU", True, config.PURPLE)
+        title_text = text_cache.render("SUDOKU", config.FONT_SIZE_LARGE, config.PURPLE, config.BLACK, 2)
         title_rect = title_text.get_rect(center=(config.SCREEN_WIDTH // 2, 150))
-        # Outline
-        for dx in [-2, 0, 2]:
-            for dy in [-2, 0, 2]:
-                if dx != 0 or dy != 0:
-                    outline_rect = title_rect.copy()
-                    outline_rect.x += dx
-                    outline_rect.y += dy
-                    outline_text = self.font_large.render("SUDOKU", True, config.BLACK)
-                    self.screen.blit(outline_text, outline_rect)
         self.screen.blit(title_text, title_rect)
         
         # Subtitle
-        subtitle_text = self.font_medium.render("SELECT DIFFICULTY", True, config.PURPLE)
+        subtitle_text = text_cache.render("SELECT DIFFICULTY", config.FONT_SIZE_MEDIUM, config.PURPLE)
         subtitle_rect = subtitle_text.get_rect(center=(config.SCREEN_WIDTH // 2, 220))
         self.screen.blit(subtitle_text, subtitle_rect)
         
@@ -286,24 +226,62 @@ class SudokuGame:
             else:
                 color = config.PURPLE
             
-            diff_text = self.font_medium.render(diff, True, color)
+            diff_text = text_cache.render(diff, config.FONT_SIZE_MEDIUM, color)
             diff_rect = diff_text.get_rect(center=(config.SCREEN_WIDTH // 2, y_pos + 20))
             self.screen.blit(diff_text, diff_rect)
         
         # Instructions
-        instruction_text = self.font_small.render("PRESS ENTER TO START", True, config.PURPLE)
+        instruction_text = text_cache.render("PRESS ENTER TO START", config.FONT_SIZE_SMALL, config.PURPLE)
         instruction_rect = instruction_text.get_rect(center=(config.SCREEN_WIDTH // 2, config.SCREEN_HEIGHT - 80))
         self.screen.blit(instruction_text, instruction_rect)
     
+    def format_time(self):
+        """Elapsed time as MM:SS"""
+        minutes = int(self.elapsed_time) // 60
+        seconds = int(self.elapsed_time) % 60
+        return f"{minutes:02d}:{seconds:02d}"
+    
+    def needs_redraw(self):
+        """Check if input, a state change or the timer changed what is on screen"""
+        if self.redraw_requested:
+            return True
+        if self.show_difficulty_menu:
+            return ("menu", self.difficulty_selected) != self.drawn_view
+        if (("won",) if self.won else ("board",)) != self.drawn_view:
+            return True
+        if self.start_time and not self.paused:
+            shown = self.drawn_text.get("timer")
+            return shown is None or shown[0] != self.format_time()
+        return False
+    
+    def draw_text(self, key, text, rect, dirty_rects):
+        """Record drawn text, marking its area dirty when the string changed"""
+        previous = self.drawn_text.get(key)
+        if previous is None or previous[0] != text:
+            dirty_rects.append(rect if previous is None else rect.union(previous[1]))
+            self.drawn_text[key] = (text, rect)
+    
     def draw(self):
-        """Draw the game"""
+        """Draw the game, return the dirty rects (None when the whole screen changed)"""
+        self.redraw_requested = False
         if self.show_difficulty_menu:
             self.draw_difficulty_menu()
-            pygame.display.flip()
-            return
-        
-        if self.font_medium is None:
-            self.initialize_fonts()
+            view = ("menu", self.difficulty_selected)
+            if view == self.drawn_view:
+                return []
+            full_redraw = self.drawn_view is None or self.drawn_view[0] != "menu"
+            self.drawn_view = view
+            if full_redraw:
+                return None
+            start_y = config.SCREEN_HEIGHT // 2 - 50
+            return [pygame.Rect(config.SCREEN_WIDTH // 2 - 180, start_y - 15, 360, 270)]
+        view = ("won",) if self.won else ("board",)
+        full_redraw = view != self.drawn_view
+        if full_redraw:
+            self.drawn_view = view
+            self.drawn_cells = {}
+            self.drawn_text = {}
+        dirty_rects = []
         
         # Background
         self.screen.fill(config.DARK_GREEN)
@@ -318,13 +296,14 @@ class SudokuGame:
         if self.start_time and not self.paused:
             minutes = int(self.elapsed_time) // 60
             seconds = int(self.elapsed_time) % 60
-            timer_text = self.font_small.render(f"TIME: {minutes:02d}:{seconds:02d}", True, config.WHITE)
+            timer_text = text_cache.render(f"TIME: {minutes:02d}:{seconds:02d}", config.FONT_SIZE_SMALL, config.WHITE)
             timer_rect = timer_text.get_rect()
             timer_rect.topright = (config.SCREEN_WIDTH - 10, 10)
             self.screen.blit(timer_text, timer_rect)
+            self.draw_text("timer", self.format_time(), timer_rect, dirty_rects)
         
         # Draw difficulty
-        diff_text = self.font_small.render(f"DIFFICULTY: {self.difficulty.upper()}", True, config.WHITE)
+        diff_text = text_cache.render(f"DIFFICULTY: {self.difficulty.upper()}", config.FONT_SIZE_SMALL, config.WHITE)
         self.screen.blit(diff_text, (10, 10))
         
         # Draw grid background
@@ -338,9 +317,13 @@ class SudokuGame:
                 cell_x = grid_x + col * cell_size
                 cell_y = grid_y + row * cell_size
                 cell_rect = pygame.Rect(cell_x, cell_y, cell_size, cell_size)
+                selected = row == self.selected_row and col == self.selected_col
+                hinted = self.hint is not None and row == self.hint.row and col == self.hint.col
                 
-                # Highlight selected cell
-                if row == self.selected_row and col == self.selected_col:
+                # Highlight selected cell, and the cell a hint points at
+                if hinted:
+                    pygame.draw.rect(self.screen, (255, 230, 120), cell_rect)
+                elif selected:
                     pygame.draw.rect(self.screen, (200, 150, 255), cell_rect)
                 
                 # Draw cell border
@@ -353,54 +336,69 @@ class SudokuGame:
                 
                 # Draw number
                 num = self.grid[row][col]
+                is_valid = True
                 if num != 0:
                     # Check if it's an original clue or user input
                     is_original = self.original_grid[row][col] != 0
-                    is_valid = self.is_valid_move(row, col, num)
+                    is_valid = self.board.is_valid(row, col)
                     
                     if is_original:
                         color = config.BLACK
-                        font = self.font_medium
+                        font_size = config.FONT_SIZE_MEDIUM
                     else:
                         # User input: green if valid, red if invalid
                         if is_valid:
                             color = (0, 150, 0)  # Dark green
                         else:
                             color = (200, 0, 0)  # Red
-                        font = self.font_small
+                        font_size = config.FONT_SIZE_SMALL
                     
-                    num_text = font.render(str(num), True, color)
+                    num_text = text_cache.render(str(num), font_size, color)
                     num_rect = num_text.get_rect(center=(cell_x + cell_size // 2, cell_y + cell_size // 2))
                     self.screen.blit(num_text, num_rect)
+                
+                # Pencil marks: the candidates left for an empty cell, laid out like a keypad
+                pencil = self.candidates.get(row, col) if self.show_candidates and num == 0 else 0
+                if pencil:
+                    third = cell_size / 3
+                    for digit in range(1, 10):
+                        if pencil & (1 << digit):
+                            mark = text_cache.render(str(digit), config.FONT_SIZE_PENCIL, (110, 110, 110))
+                            center = (cell_x + int((digit - 1) % 3 * third + third / 2),
+                                      cell_y + int((digit - 1) // 3 * third + third / 2))
+                            self.screen.blit(mark, mark.get_rect(center=center))
+                
+                # A cell's pixels depend only on its value, validity, marks, hint and selection
+                cell_key = (num, self.original_grid[row][col] != 0, is_valid, pencil, hinted, selected)
+                if self.drawn_cells.get((row, col)) != cell_key:
+                    self.drawn_cells[(row, col)] = cell_key
+                    dirty_rects.append(cell_rect)
+        
+        # Controls, or the current hint
+        footer = self.hint_message or "C: PENCIL MARKS   H: HINT"
+        footer_text = text_cache.render(footer, config.FONT_SIZE_SMALL, config.WHITE)
+        footer_rect = footer_text.get_rect(center=(config.SCREEN_WIDTH // 2, grid_y + grid_size + 25))
+        self.screen.blit(footer_text, footer_rect)
+        self.draw_text("footer", footer, footer_rect, dirty_rects)
         
         # Draw win message
         if self.won:
             # Semi-transparent overlay
-            overlay = pygame.Surface((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
-            overlay.set_alpha(200)
-            overlay.fill(config.BLACK)
-            self.screen.blit(overlay, (0, 0))
+            self.screen.blit(layer_cache.dim_overlay(200), (0, 0))
             
-            win_text = self.font_large.render("PUZZLE SOLVED!", True, config.PURPLE)
+            win_text = text_cache.render("PUZZLE SOLVED!", config.FONT_SIZE_LARGE, config.PURPLE, config.BLACK, 3)
             win_rect = win_text.get_rect(center=(config.SCREEN_WIDTH // 2, config.SCREEN_HEIGHT // 2 - 50))
-            # Outline
-            for dx in [-3, 0, 3]:
-                for dy in [-3, 0, 3]:
-                    if dx != 0 or dy != 0:
-                        outline_rect = win_rect.copy()
-                        outline_rect.x += dx
-                        outline_rect.y += dy
-                        outline_text = self.font_large.render("PUZZLE SOLVED!", True, config.BLACK)
-                        self.screen.blit(outline_text, outline_rect)
             self.screen.blit(win_text, win_rect)
             
             minutes = int(self.elapsed_time) // 60
             seconds = int(self.elapsed_time) % 60
-            time_text = self.font_medium.render(f"Time: {minutes:02d}:{seconds:02d}", True, config.PURPLE)
+            time_text = text_cache.render(f"Time: {minutes:02d}:{seconds:02d}", config.FONT_SIZE_MEDIUM, config.PURPLE)
             time_rect = time_text.get_rect(center=(config.SCREEN_WIDTH // 2, config.SCREEN_HEIGHT // 2 + 20))
             self.screen.blit(time_text, time_rect)
         
-        pygame.display.flip()
+        if full_redraw:
+            return None
+        return dirty_rects
     
     def is_game_over(self):
         """Check if game is over"""
@@ -0,0 +1,72 @@
+"""
+Unique-solution Sudoku puzzle generator
+Digs clues out of a random solved grid, keeping only removals the solver
+accepts, and grades puzzles by how the solver had to work
+"""
+import random
+import config
+from sudoku_solver import CELLS, SolveStats, solve, count_solutions
+
+DIFFICULTIES = ("easy", "medium", "hard")
+
+def grade(cells):
+    """(difficulty, stats) of a flat puzzle from one solver run
+
+    easy puzzles fall to naked singles alone, medium ones also need
+    hidden singles, and hard ones need the search to guess. Returns
+    (None, stats) when the puzzle has no solution.
+    """
+    stats = SolveStats()
+    if solve(cells, None, stats) is None:
+        return None, stats
+    if stats.guesses:
+        return "hard", stats
+    if stats.hidden:
+        return "medium", stats
+    return "easy", stats
+
+def dig(solution, difficulty, rng):
+    """Remove clues from a solved flat grid down to the difficulty's floor, return the puzzle
+
+    A clue stays removed only if the puzzle keeps a single solution. For
+    easy and medium it must also stay solvable with the singles of that
+    grade, which implies uniqueness without a full solution count.
+    """
+    level = DIFFICULTIES.index(difficulty)
+    puzzle = solution[:]
+    clues = CELLS
+    order = list(range(CELLS))
+    rng.shuffle(order)
+    for cell in order:
+        if clues <= config.SUDOKU_MIN_CLUES[difficulty]:
+            break
+        digit = puzzle[cell]
+        puzzle[cell] = 0
+        if difficulty == "hard":
+            keep = count_solutions(puzzle, 2) == 1
+        else:
+            found, _ = grade(puzzle)
+            keep = found is not None and DIFFICULTIES.index(found) <= level
+        if keep:
+            clues -= 1
+        else:
+            puzzle[cell] = digit
+    return puzzle
+
+def generate(difficulty, rng=random):
+    """(puzzle, solution) as flat 81-entry lists, 0 marking blank cells
+
+    Digging can stop short of the requested grade (most often for hard),
+    so a few solved grids are tried and the hardest puzzle is kept.
+    """
+    best = None
+    for _ in range(config.SUDOKU_GENERATE_ATTEMPTS):
+        solution = solve([0] * CELLS, rng)
+        puzzle = dig(solution, difficulty, rng)
+        found, stats = grade(puzzle)
+        if found == difficulty:
+            return puzzle, solution
+        rank = (DIFFICULTIES.index(found), stats.guesses, stats.hidden)
+        if best is None or rank > best[0]:
+            best = (rank, puzzle, solution)
+    return best[1], best[2]
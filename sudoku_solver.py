@@ -0,0 +1,188 @@
+"""
+Bitboard Sudoku solver
+Fills forced cells (naked and hidden singles) and branches on the cell with
+the fewest candidates, counting solutions with an early exit
+"""
+from sudoku_board import SIZE, ALL_DIGITS, box_index
+
+CELLS = SIZE * SIZE
+
+# Unit membership of every flat cell index (row * 9 + col)
+ROW_OF = [cell // SIZE for cell in range(CELLS)]
+COL_OF = [cell % SIZE for cell in range(CELLS)]
+BOX_OF = [box_index(cell // SIZE, cell % SIZE) for cell in range(CELLS)]
+UNITS = ([[row * SIZE + col for col in range(SIZE)] for row in range(SIZE)] +
+         [[row * SIZE + col for row in range(SIZE)] for col in range(SIZE)] +
+         [[cell for cell in range(CELLS) if BOX_OF[cell] == box] for box in range(SIZE)])
+
+# Digit held by each single-bit candidate mask
+DIGIT_OF_BIT = {1 << digit: digit for digit in range(1, SIZE + 1)}
+
+def flatten(rows):
+    """81-entry list of a grid given as rows"""
+    return [num for row in rows for num in row]
+
+def to_rows(cells):
+    """Grid rows of an 81-entry list"""
+    return [list(cells[row * SIZE:(row + 1) * SIZE]) for row in range(SIZE)]
+
+def bit_count(mask):
+    """Number of candidates in a mask"""
+    return bin(mask).count("1")
+
+class SolveStats:
+    """What a search had to do, used to grade puzzles
+
+    naked and hidden count the cells filled by each kind of single (hidden
+    singles are only looked for when no naked single is left), guesses
+    counts the cells the search had to branch on and nodes every search
+    state visited.
+    """
+
+    def __init__(self):
+        self.naked = 0
+        self.hidden = 0
+        self.guesses = 0
+        self.nodes = 0
+
+class _Search:
+    """One solve: grid and unit masks, copied at every branch"""
+
+    def __init__(self, limit, rng, stats):
+        self.limit = limit
+        self.rng = rng
+        self.stats = stats
+        self.solution = None  # First solution found
+        self.count = 0
+
+    def run(self, cells):
+        """Search from a flat grid, return False if its clues already clash"""
+        rows = [0] * SIZE
+        cols = [0] * SIZE
+        boxes = [0] * SIZE
+        for cell, num in enumerate(cells):
+            if num:
+                bit = 1 << num
+                if (rows[ROW_OF[cell]] | cols[COL_OF[cell]] | boxes[BOX_OF[cell]]) & bit:
+                    return False
+                rows[ROW_OF[cell]] |= bit
+                cols[COL_OF[cell]] |= bit
+                boxes[BOX_OF[cell]] |= bit
+        self.search(list(cells), rows, cols, boxes)
+        return True
+
+    def search(self, cells, rows, cols, boxes):
+        """Depth-first search; stops once limit solutions are found"""
+        stats = self.stats
+        stats.nodes += 1
+        while True:
+            # Naked singles, remembering the most constrained open cell
+            best = -1
+            best_count = SIZE + 1
+            placed = False
+            for cell in range(CELLS):
+                if cells[cell]:
+                    continue
+                row, col, box = ROW_OF[cell], COL_OF[cell], BOX_OF[cell]
+                candidates = ALL_DIGITS & ~(rows[row] | cols[col] | boxes[box])
+                if not candidates:
+                    return
+                if candidates & (candidates - 1) == 0:
+                    cells[cell] = DIGIT_OF_BIT[candidates]
+                    rows[row] |= candidates
+                    cols[col] |= candidates
+                    boxes[box] |= candidates
+                    stats.naked += 1
+                    placed = True
+                elif not placed:
+                    count = bit_count(candidates)
+                    if count < best_count:
+                        best, best_count = cell, count
+            if placed:
+                continue
+            if best < 0:
+                # Every cell is filled
+                self.count += 1
+                if self.solution is None:
+                    self.solution = cells
+                return
+
+            # Hidden singles: a digit with only one place left in a unit
+            found = self.hidden_single(cells, rows, cols, boxes)
+            if found is None:
+                return
+            if not found:
+                break
+
+        # Branch on the open cell with the fewest candidates
+        stats.guesses += 1
+        row, col, box = ROW_OF[best], COL_OF[best], BOX_OF[best]
+        candidates = ALL_DIGITS & ~(rows[row] | cols[col] | boxes[box])
+        bits = []
+        while candidates:
+            bit = candidates & -candidates
+            bits.append(bit)
+            candidates ^= bit
+        if self.rng is not None:
+            self.rng.shuffle(bits)
+        for bit in bits:
+            branch = cells[:]
+            branch[best] = DIGIT_OF_BIT[bit]
+            branch_rows = rows[:]
+            branch_cols = cols[:]
+            branch_boxes = boxes[:]
+            branch_rows[row] |= bit
+            branch_cols[col] |= bit
+            branch_boxes[box] |= bit
+            self.search(branch, branch_rows, branch_cols, branch_boxes)
+            if self.count >= self.limit:
+                return
+
+    def hidden_single(self, cells, rows, cols, boxes):
+        """Fill one hidden single; True if one was filled, False if none, None on a contradiction"""
+        for unit in UNITS:
+            once = 0
+            twice = 0
+            present = 0
+            for cell in unit:
+                num = cells[cell]
+                if num:
+                    present |= 1 << num
+                    continue
+                candidates = ALL_DIGITS & ~(rows[ROW_OF[cell]] | cols[COL_OF[cell]] | boxes[BOX_OF[cell]])
+                twice |= once & candidates
+                once |= candidates
+            missing = ALL_DIGITS & ~present
+            if missing & ~once:
+                return None  # A digit has nowhere left to go in this unit
+            singles = once & ~twice & missing
+            if not singles:
+                continue
+            bit = singles & -singles
+            for cell in unit:
+                if not cells[cell] and not (rows[ROW_OF[cell]] | cols[COL_OF[cell]] | boxes[BOX_OF[cell]]) & bit:
+                    cells[cell] = DIGIT_OF_BIT[bit]
+                    rows[ROW_OF[cell]] |= bit
+                    cols[COL_OF[cell]] |= bit
+                    boxes[BOX_OF[cell]] |= bit
+                    self.stats.hidden += 1
+                    return True
+        return False
+
+def count_solutions(cells, limit=2, stats=None):
+    """Number of solutions of a flat grid, stopping the search at limit"""
+    search = _Search(limit, None, stats or SolveStats())
+    if not search.run(cells):
+        return 0
+    return search.count
+
+def solve(cells, rng=None, stats=None):
+    """First solution of a flat grid as a new list, None if it has none
+
+    With rng, branches try digits in random order, so solving an empty
+    grid gives a random complete one.
+    """
+    search = _Search(1, rng, stats or SolveStats())
+    if not search.run(cells):
+        return None
+    return search.solution
@@ -0,0 +1,50 @@
+"""
+FlappyBatch must replay FlappyBird exactly for the same seed and flaps
+"""
+import os
+import pytest
+import config
+import high_score
+
+np = pytest.importorskip("numpy")
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import pygame
+import flappy_batch
+from flappy_bird import FlappyBird
+
+@pytest.fixture(scope="module")
+def screen():
+    pygame.display.init()
+    yield pygame.display.set_mode((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
+    pygame.display.quit()
+
+@pytest.mark.parametrize("seed", [1, 2])
+def test_batch_matches_single_games(seed, screen, monkeypatch):
+    monkeypatch.setattr(high_score, "update_high_score", lambda *args, **kwargs: False)
+    count = 24
+    batch = flappy_batch.FlappyBatch(count, seed)
+    games = [FlappyBird(screen, seed) for _ in range(count)]
+    flap = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE)
+    rng = np.random.default_rng(seed)
+    # Each bird aims a different distance below the gap's centre, so they die at different pipes
+    aim = rng.integers(-40, 60, count)
+
+    for frame in range(3000):
+        pipe = batch.next_pipe()
+        target = (pipe[1] + pipe[2]) / 2 if pipe else config.SCREEN_HEIGHT / 2
+        flaps = (batch.bird_y > target + aim) & (batch.bird_velocity > 0) | (rng.random(count) < 0.01)
+        for game, flapped in zip(games, flaps):
+            if flapped:
+                game.handle_event(flap)
+            game.update()
+        batch.step(flaps)
+
+        for i, game in enumerate(games):
+            assert (batch.score[i], batch.dead[i], batch.bird_y[i], batch.frame_count[i]) == \
+                (game.score, game.game_over, game.bird_y, game.frame_count), (frame, i)
+            if game.game_over:
+                assert batch.frame_impact[i] == game.frame_impact
+        if batch.dead.all():
+            break
+    assert batch.dead.any()
+    assert batch.score.max() > 0
@@ -0,0 +1,77 @@
+"""
+Durability of runs written through the persistence worker
+"""
+import sqlite3
+import config
+import leaderboard
+import persistence
+
+def fast_retries(monkeypatch):
+    """Short lock waits and retry delays so a busy database fails quickly"""
+    monkeypatch.setattr(config, "LEADERBOARD_BUSY_TIMEOUT", 0.05)
+    monkeypatch.setattr(config, "PERSISTENCE_RETRY_DELAY", 0.01)
+    monkeypatch.setattr(config, "PERSISTENCE_RETRY_MAX_DELAY", 0.05)
+
+def test_shutdown_commits_every_submitted_run(tmp_path):
+    path = str(tmp_path / "leaderboard.db")
+    worker = persistence.PersistenceWorker(lambda: leaderboard.Leaderboard(path))
+    for score in range(100):
+        assert worker.submit({"game": "snake", "score": score, "duration": 1.0, "difficulty": None})
+    worker.shutdown(timeout=5)
+
+    board = leaderboard.Leaderboard(path)
+    assert worker.committed == 100
+    assert board.run_count("snake") == 100
+    assert board.best_score("snake") == 99
+    board.close()
+
+def test_failed_write_is_retried_and_not_reported_committed(tmp_path, monkeypatch):
+    fast_retries(monkeypatch)
+    path = str(tmp_path / "leaderboard.db")
+    board = leaderboard.Leaderboard(path)
+    committed = []
+    worker = persistence.PersistenceWorker(lambda: leaderboard.Leaderboard(path), on_commit=committed.extend)
+
+    # Another process holds the write lock for longer than the busy timeout
+    blocker = sqlite3.connect(path, isolation_level=None)
+    blocker.execute("BEGIN IMMEDIATE")
+    try:
+        assert worker.submit({"game": "snake", "score": 7})
+        assert not worker.flush(timeout=5)
+        assert worker.errors >= 1
+        assert worker.committed == 0
+        assert committed == []
+    finally:
+        blocker.execute("COMMIT")
+        blocker.close()
+
+    # Once the lock is released the retry lands the same run exactly once
+    assert worker.flush(timeout=5)
+    assert len(committed) == 1
+    assert board.run_count("snake") == 1
+    assert board.best_score("snake") == 7
+    worker.shutdown(timeout=5)
+    board.close()
+
+def test_busy_flush_keeps_queued_runs(tmp_path, monkeypatch):
+    fast_retries(monkeypatch)
+    path = str(tmp_path / "leaderboard.db")
+    board = leaderboard.Leaderboard(path)
+    board.record_run("flappy_bird", 12)
+
+    blocker = sqlite3.connect(path, isolation_level=None)
+    blocker.execute("BEGIN IMMEDIATE")
+    try:
+        try:
+            board.flush()
+        except sqlite3.OperationalError:
+            pass
+        assert len(board.pending) == 1
+    finally:
+        blocker.execute("COMMIT")
+        blocker.close()
+
+    board.flush()
+    assert board.pending == []
+    assert board.run_count("flappy_bird") == 1
+    board.close()
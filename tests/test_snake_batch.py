@@ -0,0 +1,47 @@
+"""
+SnakeBatch must replay SnakeGame exactly for the same seeds and keys
+"""
+import random
+import pytest
+import pygame
+import config
+import high_score
+from snake_game import SnakeGame
+
+np = pytest.importorskip("numpy")
+import snake_batch
+
+KEYS = [pygame.K_UP, pygame.K_DOWN, pygame.K_LEFT, pygame.K_RIGHT]  # Indexed by snake_batch actions
+
+@pytest.mark.parametrize("width, height", [(4, 3), (6, 5), (12, 9)])
+def test_batch_matches_single_games(width, height, monkeypatch):
+    monkeypatch.setattr(config, "GRID_WIDTH", width)
+    monkeypatch.setattr(config, "GRID_HEIGHT", height)
+    monkeypatch.setattr(high_score, "update_high_score", lambda *args, **kwargs: False)
+    # Negative and oversized seeds are reduced to 64 bits by both implementations
+    seeds = [0, 1, -1, -12345, 2 ** 64 + 7, 987654321]
+    batch = snake_batch.SnakeBatch(seeds)
+    games = [SnakeGame(None, seed) for seed in seeds]
+    rng = random.Random(width * height)
+
+    for frame in range(1500):
+        actions = np.array([rng.randrange(-1, 4) for _ in seeds])
+        for game, action in zip(games, actions):
+            if action >= 0:
+                game.handle_event(pygame.event.Event(pygame.KEYDOWN, key=KEYS[action]))
+            game.update()
+        batch.step(actions)
+
+        heads = batch.head_positions()
+        apples = batch.apple_positions()
+        for i, game in enumerate(games):
+            assert (batch.score[i], batch.dead[i], batch.frame_count[i]) == (game.score, game.game_over, game.frame_count), frame
+            assert tuple(heads[i]) == game.engine.head
+            assert tuple(apples[i]) == (game.engine.apple_position() or (-1, -1))
+            assert list(batch.free[i, :batch.free_count[i]]) == game.engine.free
+
+        dead = batch.dead.copy()
+        if dead.any():
+            batch.reset(dead)
+            for i in np.flatnonzero(dead):
+                games[i].reset_game()
@@ -0,0 +1,66 @@
+"""
+Shared fonts and a cache of rendered text surfaces
+Outlined titles are composed once from a mask instead of re-rendering per offset
+"""
+from collections import OrderedDict
+import pygame
+import config
+
+_fonts = {}  # (name, size) -> pygame.font.Font
+_surfaces = OrderedDict()  # (text, font name, size, color, outline color, outline width, antialias) -> Surface
+
+def get_font(size, name=None):
+    """Return the shared Font for a size, creating it on first use"""
+    key = (name, size)
+    font = _fonts.get(key)
+    if font is None:
+        font = pygame.font.Font(name, size)
+        _fonts[key] = font
+    return font
+
+def render(text, size, color, outline_color=None, outline_width=0, name=None, antialias=True, full_outline=False):
+    """Return a cached surface for text, optionally with an outline
+
+    An outlined surface is outline_width pixels larger on every side, so
+    centring it on the same point as the plain text lines the glyphs up.
+    See add_outline for full_outline.
+    """
+    key = (text, name, size, tuple(color), outline_color and tuple(outline_color), outline_width, antialias,
+           full_outline)
+    surface = _surfaces.get(key)
+    if surface is not None:
+        _surfaces.move_to_end(key)
+        return surface
+
+    font = get_font(size, name)
+    surface = font.render(text, antialias, color)
+    if outline_color is not None and outline_width > 0:
+        surface = add_outline(surface, outline_color, outline_width, full_outline)
+
+    _surfaces[key] = surface
+    if len(_surfaces) > config.TEXT_CACHE_SIZE:
+        _surfaces.popitem(last=False)
+    return surface
+
+def add_outline(surface, outline_color, outline_width, full=False):
+    """Put a text surface on top of an outline built from its mask
+
+    The silhouette is stamped at the 8 offsets of -w, 0 and w in each
+    direction, or at every offset up to w when full is set, which gives a
+    thicker, solid outline.
+    """
+    mask = pygame.mask.from_surface(surface)
+    silhouette = mask.to_surface(setcolor=outline_color, unsetcolor=(0, 0, 0, 0))
+    width, height = surface.get_size()
+    result = pygame.Surface((width + outline_width * 2, height + outline_width * 2), pygame.SRCALPHA)
+    offsets = range(-outline_width, outline_width + 1) if full else (-outline_width, 0, outline_width)
+    for dx in offsets:
+        for dy in offsets:
+            if dx != 0 or dy != 0:
+                result.blit(silhouette, (outline_width + dx, outline_width + dy))
+    result.blit(surface, (outline_width, outline_width))
+    return result
+
+def clear():
+    """Drop every cached surface"""
+    _surfaces.clear()
@@ -0,0 +1,47 @@
+"""
+Fixed-timestep scheduler that decouples simulation from rendering
+"""
+import time
+import config
+
+class FixedTimestep:
+    """Accumulator-based scheduler for fixed simulation ticks
+
+    Each rendered frame calls advance(), which returns how many simulation
+    ticks to run and the interpolation factor (0..1) for rendering between
+    the last two simulated states.
+    """
+
+    def __init__(self, tick_rate=None, max_catch_up=None):
+        self.tick_rate = tick_rate or config.SIM_TICK_RATE
+        self.tick_length = 1.0 / self.tick_rate
+        self.max_catch_up = max_catch_up or config.MAX_CATCH_UP_TICKS
+        self.accumulator = 0.0
+        self.last_time = None
+        self.dropped_ticks = 0
+
+    def reset(self):
+        """Restart timing, e.g. when a new game starts"""
+        self.accumulator = 0.0
+        self.last_time = time.perf_counter()
+
+    def advance(self):
+        """Return (ticks, alpha) for the frame about to be rendered"""
+        now = time.perf_counter()
+        if self.last_time is None:
+            self.last_time = now
+            # Always simulate the very first frame so there is something to draw
+            return 1, 1.0
+        self.accumulator += now - self.last_time
+        self.last_time = now
+
+        ticks = int(self.accumulator / self.tick_length)
+        if ticks > self.max_catch_up:
+            # Too far behind (breakpoint, slow load); drop the backlog instead of spiralling
+            self.dropped_ticks += ticks - self.max_catch_up
+            ticks = self.max_catch_up
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= ticks * self.tick_length
+
+        return ticks, self.accumulator / self.tick_length